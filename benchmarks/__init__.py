@@ -0,0 +1,13 @@
+"""
+Micro benchmarks for the Python Injection Framework (PIF).
+
+Run with `python -m benchmarks --help` from the project root.
+"""
+
+import sys
+from pathlib import Path
+
+# Benchmark the working tree (as `pytest` does) rather than requiring the project to be installed.
+_SRC = str(Path(__file__).resolve().parent.parent / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
@@ -0,0 +1,65 @@
+#                  _   _                 _     _
+#    ___  ___ ___ | |_| |_ ______ _  ___| |__ / |
+#   / __|/ __/ _ \| __| __|_  / _` |/ __| '_ \| |
+#   \__ \ (_| (_) | |_| |_ / / (_| | (__| | | | |
+#   |___/\___\___/ \__|\__/___\__,_|\___|_| |_|_|
+#
+#        Zac Scott (github.com/scottzach1)
+#
+#  https://github.com/scottzach1/python-injector-framework
+
+import argparse
+import datetime
+import importlib.metadata
+import json
+import platform
+import sys
+from pathlib import Path
+
+from benchmarks import bench_providers, bench_wiring  # noqa: F401 (registers benchmarks)
+from benchmarks.harness import collect, run
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run the PIF micro benchmarks.")
+    parser.add_argument("patterns", nargs="*", help="glob patterns to select benchmarks, e.g. 'inject.*'.")
+    parser.add_argument("-o", "--output", type=Path, help="write JSON results to this file.")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="number of timed repeats per benchmark.")
+    parser.add_argument("-t", "--min-time", type=float, default=0.2, help="minimum seconds per repeat.")
+    parser.add_argument("-l", "--list", action="store_true", help="list benchmarks and exit.")
+    args = parser.parse_args(argv)
+
+    benchmarks = list(collect(args.patterns))
+    if args.list:
+        print("\n".join(bench.name for bench in benchmarks))
+        return 0
+
+    results = []
+    for bench in benchmarks:
+        result = run(bench, repeat=args.repeat, min_time=args.min_time)
+        results.append(result.as_dict())
+        print(f"{result.name:<45} {result.median:>14,.1f} ns  (±{result.stdev:,.1f})", file=sys.stderr)
+
+    try:
+        version = importlib.metadata.version("python-injection-framework")
+    except importlib.metadata.PackageNotFoundError:
+        version = None
+
+    report = {
+        "version": version,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": datetime.datetime.now(datetime.UTC).isoformat(),
+        "unit": "ns",
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
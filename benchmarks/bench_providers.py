@@ -0,0 +1,135 @@
+#                  _   _                 _     _
+#    ___  ___ ___ | |_| |_ ______ _  ___| |__ / |
+#   / __|/ __/ _ \| __| __|_  / _` |/ __| '_ \| |
+#   \__ \ (_| (_) | |_| |_ / / (_| | (__| | | | |
+#   |___/\___\___/ \__|\__/___\__,_|\___|_| |_|_|
+#
+#        Zac Scott (github.com/scottzach1)
+#
+#  https://github.com/scottzach1/python-injector-framework
+
+from collections.abc import Callable
+
+from benchmarks.harness import benchmark
+from scottzach1.pif import graph, providers
+from scottzach1.pif.providers.util import intercept_args
+
+DEPTH = 10
+WIDTH = 10
+
+
+def _leaf(*args, **kwargs):
+    return args, kwargs
+
+
+def deep(cls: Callable[..., providers.Provider], depth: int = DEPTH) -> providers.Provider:
+    """
+    Build a chain of `depth` providers each depending on the previous.
+    """
+    provider = providers.ExistingSingleton(0)
+    for _ in range(depth):
+        provider = cls(_leaf, provider)
+    return provider
+
+
+def wide(cls: Callable[..., providers.Provider], width: int = WIDTH) -> providers.Provider:
+    """
+    Build a provider with `width` positional and `width` keyword provider arguments.
+    """
+    args = [providers.ExistingSingleton(i) for i in range(width)]
+    kwargs = {f"k{i}": providers.ExistingSingleton(i) for i in range(width)}
+    return cls(_leaf, *args, **kwargs)
+
+
+@benchmark("providers")
+def existing_singleton():
+    return providers.ExistingSingleton(object())
+
+
+@benchmark("providers")
+def factory_no_args():
+    return providers.Factory(_leaf)
+
+
+@benchmark("providers")
+def factory_static_args():
+    return providers.Factory(_leaf, 1, "x", key=None)
+
+
+@benchmark("providers")
+def factory_deep():
+    return deep(providers.Factory)
+
+
+@benchmark("providers")
+def factory_wide():
+    return wide(providers.Factory)
+
+
+@benchmark("providers")
+def factory_deep_flattened():
+    return graph.flatten(deep(providers.Factory))
+
+
+@benchmark("providers")
+def factory_wide_flattened():
+    return graph.flatten(wide(providers.Factory))
+
+
+@benchmark("batch")
+def factory_loop_100():
+    provider = wide(providers.Factory)
+    return lambda: [provider() for _ in range(100)]
+
+
+@benchmark("batch")
+def factory_many_100():
+    provider = wide(providers.Factory)
+    return lambda: provider.many(100)
+
+
+@benchmark("providers")
+def singleton_hit():
+    provider = providers.Singleton(_leaf)
+    provider()
+    return provider
+
+
+@benchmark("providers")
+def singleton_deep_hit():
+    provider = deep(providers.Singleton)
+    provider()
+    return provider
+
+
+@benchmark("providers")
+def factory_over_singletons_wide():
+    args = [providers.Singleton(_leaf, i) for i in range(WIDTH)]
+    return providers.Factory(_leaf, *args)
+
+
+@benchmark("providers")
+def intercept_args_wide():
+    func = intercept_args(_leaf)
+    args = [providers.ExistingSingleton(i) for i in range(WIDTH)]
+    kwargs = {f"k{i}": providers.ExistingSingleton(i) for i in range(WIDTH)}
+    return lambda: func(*args, **kwargs)
+
+
+@benchmark("override")
+def override_enter_exit():
+    provider = providers.ExistingSingleton(1)
+    replacement = providers.ExistingSingleton(2)
+
+    def stmt():
+        with provider.override(replacement):
+            pass
+
+    return stmt
+
+
+@benchmark("override")
+def overridden_call():
+    provider = providers.ExistingSingleton(1)
+    provider.override_existing(2)
+    return provider
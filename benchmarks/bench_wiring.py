@@ -0,0 +1,104 @@
+#                  _   _                 _     _
+#    ___  ___ ___ | |_| |_ ______ _  ___| |__ / |
+#   / __|/ __/ _ \| __| __|_  / _` |/ __| '_ \| |
+#   \__ \ (_| (_) | |_| |_ / / (_| | (__| | | | |
+#   |___/\___\___/ \__|\__/___\__,_|\___|_| |_|_|
+#
+#        Zac Scott (github.com/scottzach1)
+#
+#  https://github.com/scottzach1/python-injector-framework
+
+import inspect
+import sys
+import types
+
+from benchmarks.harness import benchmark
+from scottzach1.pif import providers, wiring
+
+PROVIDER = providers.ExistingSingleton("value")
+
+
+def _target(a, b=PROVIDER, /, c=PROVIDER, *args, d=PROVIDER):
+    return a, b, c, d
+
+
+def synthetic_module(name: str, functions: int, classes: int, methods: int) -> types.ModuleType:
+    """
+    Build (and register) a module with `functions` functions and `classes` classes of `methods` methods.
+
+    Half of the functions and methods have a `Provider` default argument.
+    """
+    lines = ["from scottzach1.pif import providers", "P = providers.ExistingSingleton('value')"]
+    for i in range(functions):
+        lines.append(f"def func_{i}(a, b={'P' if i % 2 else 'None'}):\n    return a, b")
+    for i in range(classes):
+        lines.append(f"class Class_{i}:")
+        for j in range(methods):
+            lines.append(f"    def method_{j}(self, a, b={'P' if j % 2 else 'None'}):\n        return a, b")
+
+    module = types.ModuleType(name)
+    exec(compile("\n".join(lines), name, "exec"), module.__dict__)
+    sys.modules[name] = module
+    return module
+
+
+@benchmark("inject")
+def call_undecorated():
+    return lambda: _target(1, 2, 3, d=4)
+
+
+@benchmark("inject")
+def call_decorated_all_supplied():
+    func = wiring.inject(_target)
+    return lambda: func(1, 2, 3, d=4)
+
+
+@benchmark("inject")
+def call_decorated_all_injected():
+    func = wiring.inject(_target)
+    return lambda: func(1)
+
+
+@benchmark("inject")
+def patch_args():
+    signature = inspect.signature(_target)
+    return lambda: wiring.patch_args(signature, (1,), {})
+
+
+@benchmark("inject")
+def decorate():
+    return lambda: wiring.inject(_target)
+
+
+@benchmark("wire")
+def wire_unwire_functions():
+    module = synthetic_module("_pif_bench_functions", functions=2000, classes=0, methods=0)
+
+    def stmt():
+        wiring.wire([module])
+        wiring.unwire([module])
+
+    return stmt
+
+
+@benchmark("wire")
+def wire_unwire_classes():
+    module = synthetic_module("_pif_bench_classes", functions=0, classes=500, methods=8)
+
+    def stmt():
+        wiring.wire([module])
+        wiring.unwire([module])
+
+    return stmt
+
+
+@benchmark("wire")
+def wire_unwire_handle():
+    module = synthetic_module("_pif_bench_handle", functions=1000, classes=250, methods=8)
+    return lambda: wiring.unwire(wiring.wire([module]))
+
+
+@benchmark("wire")
+def unwire_clean():
+    module = synthetic_module("_pif_bench_clean", functions=1000, classes=250, methods=8)
+    return lambda: wiring.unwire([module])
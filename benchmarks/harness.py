@@ -0,0 +1,100 @@
+#                  _   _                 _     _
+#    ___  ___ ___ | |_| |_ ______ _  ___| |__ / |
+#   / __|/ __/ _ \| __| __|_  / _` |/ __| '_ \| |
+#   \__ \ (_| (_) | |_| |_ / / (_| | (__| | | | |
+#   |___/\___\___/ \__|\__/___\__,_|\___|_| |_|_|
+#
+#        Zac Scott (github.com/scottzach1)
+#
+#  https://github.com/scottzach1/python-injector-framework
+
+import dataclasses
+import fnmatch
+import statistics
+import timeit
+from collections.abc import Callable, Iterator
+
+__all__ = ("Benchmark", "Result", "benchmark", "collect", "run")
+
+_REGISTRY: dict[str, "Benchmark"] = {}
+
+
+@dataclasses.dataclass(frozen=True)
+class Benchmark:
+    """
+    A registered benchmark.
+
+    `setup` is called once and must return the zero argument callable to time.
+    """
+
+    name: str
+    group: str
+    setup: Callable[[], Callable[[], object]]
+
+
+@dataclasses.dataclass(frozen=True)
+class Result:
+    """
+    Timings for a single benchmark, all durations are nanoseconds per call.
+    """
+
+    name: str
+    group: str
+    number: int
+    repeat: int
+    min: float
+    mean: float
+    median: float
+    stdev: float
+
+    def as_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+
+def benchmark(group: str, name: str | None = None):
+    """
+    Register a benchmark setup function.
+
+    :param group: used to group related benchmarks in the report.
+    :param name: of the benchmark, defaults to the function name.
+    """
+
+    def decorator(setup: Callable[[], Callable[[], object]]):
+        key = f"{group}.{name or setup.__name__}"
+        _REGISTRY[key] = Benchmark(name=key, group=group, setup=setup)
+        return setup
+
+    return decorator
+
+
+def collect(patterns: list[str] | None = None) -> Iterator[Benchmark]:
+    """
+    Get all registered benchmarks matching any of the provided glob patterns.
+    """
+    for name, bench in _REGISTRY.items():
+        if not patterns or any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+            yield bench
+
+
+def run(bench: Benchmark, repeat: int = 5, min_time: float = 0.2) -> Result:
+    """
+    Time a benchmark, calibrating the number of loops so each repeat takes at least `min_time` seconds.
+    """
+    stmt = bench.setup()
+    timer = timeit.Timer(stmt)
+
+    number = 1
+    while (elapsed := timer.timeit(number)) < min_time:
+        number = max(number * 2, int(number * min_time / elapsed) + 1) if elapsed else number * 10
+
+    samples = [t / number * 1e9 for t in timer.repeat(repeat=repeat, number=number)]
+    return Result(
+        name=bench.name,
+        group=bench.group,
+        number=number,
+        repeat=repeat,
+        min=min(samples),
+        mean=statistics.fmean(samples),
+        median=statistics.median(samples),
+        stdev=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    )
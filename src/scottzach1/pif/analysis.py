@@ -0,0 +1,335 @@
+#                  _   _                 _     _
+#    ___  ___ ___ | |_| |_ ______ _  ___| |__ / |
+#   / __|/ __/ _ \| __| __|_  / _` |/ __| '_ \| |
+#   \__ \ (_| (_) | |_| |_ / / (_| | (__| | | | |
+#   |___/\___\___/ \__|\__/___\__,_|\___|_| |_|_|
+#
+#        Zac Scott (github.com/scottzach1)
+#
+#  https://github.com/scottzach1/python-injector-framework
+
+from __future__ import annotations
+
+import argparse
+import ast
+import importlib.machinery
+import json
+import os
+import sys
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+
+from scottzach1.pif import providers
+from scottzach1.pif.cache import Target
+
+__all__ = ("Index", "find_modules", "analyse", "main")
+
+_PROVIDERS = "scottzach1.pif.providers"
+_PROVIDER_TYPES = frozenset(
+    name for name, obj in vars(providers).items() if isinstance(obj, type) and issubclass(obj, providers.Provider)
+)
+
+
+class Index:
+    """
+    The functions and methods of each module that need wiring, see `analyse`.
+
+    Pass the index to `wiring.wire` to patch only the indexed targets rather than scanning each module, modules absent
+    from the index are still scanned. Wire `index.modules` to only import the modules that need wiring.
+    """
+
+    __slots__ = ("targets",)
+
+    VERSION = 1
+
+    def __init__(self, targets: dict[str, list[Target]] | None = None):
+        self.targets: dict[str, list[Target]] = targets or {}
+
+    @property
+    def modules(self) -> list[str]:
+        """
+        The names of the modules with any targets.
+        """
+        return [name for name, targets in self.targets.items() if targets]
+
+    def get(self, module: str) -> list[Target] | None:
+        """
+        Get the indexed targets for a module.
+
+        :param module: name to lookup.
+        :return: the attribute paths to wire, or None if the module was not analysed.
+        """
+        return self.targets.get(module)
+
+    def as_dict(self) -> dict:
+        return {"version": self.VERSION, "modules": {name: [list(t) for t in ts] for name, ts in self.targets.items()}}
+
+    def save(self, path: str | os.PathLike) -> None:
+        """
+        Write the index to a JSON file.
+        """
+        Path(path).write_text(json.dumps(self.as_dict(), indent=2))
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> Index:
+        """
+        Read an index written by `save`.
+
+        :raises ValueError: if the file was written by an incompatible version.
+        """
+        data = json.loads(Path(path).read_text())
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported index version {data.get('version')!r} in {path}")
+        return cls({name: [tuple(t) for t in ts] for name, ts in data["modules"].items()})
+
+
+def find_modules(package: str, path: Sequence[str | os.PathLike] | None = None) -> dict[str, Path]:
+    """
+    Locate the source files of a module, or a package and all of its submodules, without importing anything.
+
+    :param package: dotted name of the module or package.
+    :param path: directories to search for the top level package, defaults to `sys.path`.
+    :return: each module name mapped to its source file.
+    """
+    top, *parts = package.split(".")
+    spec = importlib.machinery.PathFinder.find_spec(top, [os.fspath(p) for p in path] if path else None)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {top!r}", name=top)
+
+    if not spec.submodule_search_locations:
+        return {package: Path(spec.origin)} if not parts and spec.origin and spec.origin.endswith(".py") else {}
+
+    modules = {}
+    for location in spec.submodule_search_locations:
+        base = Path(location, *parts)
+        if base.is_dir():
+            for file in sorted(base.rglob("*.py")):
+                relative = file.relative_to(base).with_suffix("").parts
+                if relative[-1] == "__init__":
+                    relative = relative[:-1]
+                modules[".".join((package, *relative))] = file
+        elif (file := base.with_suffix(".py")).is_file():
+            modules[package] = file
+    return modules
+
+
+class _Module:
+    """
+    The statically known names of a module.
+    """
+
+    def __init__(self, name: str, tree: ast.Module, is_package: bool):
+        self.name = name
+        self.tree = tree
+        self.imports: dict[str, str] = {}
+        """Each imported local name mapped to the qualified name it refers to."""
+        self.symbols: dict[str, ast.expr | ast.ClassDef] = {}
+        """Each module level name (and class attribute, e.g. `Container.db`) mapped to its value."""
+
+        package = name if is_package else name.rpartition(".")[0]
+        for node in tree.body:
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    if alias.asname:
+                        self.imports[alias.asname] = alias.name
+                    else:
+                        top = alias.name.partition(".")[0]
+                        self.imports[top] = top
+            elif isinstance(node, ast.ImportFrom):
+                base = node.module or ""
+                if node.level:
+                    parent = package.rsplit(".", node.level - 1)[0] if node.level > 1 else package
+                    base = f"{parent}.{base}" if base else parent
+                for alias in node.names:
+                    self.imports[alias.asname or alias.name] = f"{base}.{alias.name}"
+            elif isinstance(node, ast.ClassDef):
+                self.symbols[node.name] = node
+                for item in node.body:
+                    for target, value in _assignments(item):
+                        self.symbols[f"{node.name}.{target}"] = value
+            else:
+                for target, value in _assignments(node):
+                    self.symbols[target] = value
+
+    def qualify(self, expr: ast.expr) -> str | None:
+        """
+        Get the qualified name a `Name` or `Attribute` expression refers to.
+        """
+        if isinstance(expr, ast.Attribute):
+            return f"{base}.{expr.attr}" if (base := self.qualify(expr.value)) else None
+        if isinstance(expr, ast.Name):
+            return self.imports.get(expr.id, f"{self.name}.{expr.id}")
+        return None
+
+
+def _assignments(node: ast.stmt) -> Iterator[tuple[str, ast.expr]]:
+    if isinstance(node, ast.Assign):
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                yield target.id, node.value
+    elif isinstance(node, ast.AnnAssign) and node.value is not None and isinstance(node.target, ast.Name):
+        yield node.target.id, node.value
+
+
+class _Analyser:
+    """
+    Resolves which expressions evaluate to a `Provider`, following names across the analysed modules.
+    """
+
+    def __init__(self, modules: dict[str, _Module]):
+        self.modules = modules
+        self._resolving: set[str] = set()
+
+    def lookup(self, qualified: str) -> tuple[_Module, ast.expr | ast.ClassDef] | None:
+        """
+        Find the value a qualified name was assigned in an analysed module, following imports.
+        """
+        module_name, symbol = qualified, ""
+        while module_name not in self.modules:
+            if "." not in module_name:
+                return None
+            module_name, _, head = module_name.rpartition(".")
+            symbol = f"{head}.{symbol}" if symbol else head
+
+        module = self.modules[module_name]
+        if not symbol:
+            return None
+        if (value := module.symbols.get(symbol)) is not None:
+            return module, value
+
+        head, _, rest = symbol.partition(".")
+        if head in module.imports and qualified not in self._resolving:
+            self._resolving.add(qualified)
+            try:
+                return self.lookup(f"{module.imports[head]}.{rest}" if rest else module.imports[head])
+            finally:
+                self._resolving.discard(qualified)
+        return None
+
+    def is_provider_type(self, qualified: str | None) -> bool:
+        if qualified is None or qualified in self._resolving:
+            return False
+        if qualified.startswith(f"{_PROVIDERS}.") and qualified.rpartition(".")[2] in _PROVIDER_TYPES:
+            return True
+
+        if not (found := self.lookup(qualified)) or not isinstance(found[1], ast.ClassDef):
+            return False
+        module, cls = found
+        self._resolving.add(qualified)
+        try:
+            return any(self.is_provider_type(module.qualify(base)) for base in cls.bases)
+        finally:
+            self._resolving.discard(qualified)
+
+    def is_provider(self, module: _Module, expr: ast.expr) -> bool:
+        """
+        Whether an expression evaluates to a `Provider`, as far as can be determined statically.
+        """
+        if isinstance(expr, ast.Call):
+            return self.is_provider_type(module.qualify(expr.func))
+
+        if (qualified := module.qualify(expr)) is None or qualified in self._resolving:
+            return False
+        if not (found := self.lookup(qualified)) or isinstance(found[1], ast.ClassDef):
+            return False
+        self._resolving.add(qualified)
+        try:
+            return self.is_provider(*found)
+        finally:
+            self._resolving.discard(qualified)
+
+    def injects(self, module: _Module, func: ast.FunctionDef | ast.AsyncFunctionDef) -> bool:
+        defaults = (*func.args.defaults, *(d for d in func.args.kw_defaults if d is not None))
+        return any(self.is_provider(module, default) for default in defaults)
+
+    def methods(self, module: _Module, cls: ast.ClassDef) -> dict[str, tuple[_Module, ast.FunctionDef]]:
+        """
+        Get the methods wiring would patch on a class, including those inherited from analysed classes.
+        """
+        methods: dict[str, tuple[_Module, ast.FunctionDef]] = {}
+        for item in cls.body:
+            if isinstance(item, ast.FunctionDef | ast.AsyncFunctionDef) and not any(
+                isinstance(d, ast.Name) and d.id in ("classmethod", "property") for d in item.decorator_list
+            ):
+                methods[item.name] = (module, item)
+        for item in cls.body:
+            for target, _ in _assignments(item):
+                methods.pop(target, None)
+
+        for base in cls.bases:
+            if (qualified := module.qualify(base)) is None or qualified in self._resolving:
+                continue
+            if (found := self.lookup(qualified)) and isinstance(found[1], ast.ClassDef):
+                self._resolving.add(qualified)
+                try:
+                    for name, method in self.methods(*found).items():
+                        methods.setdefault(name, method)
+                finally:
+                    self._resolving.discard(qualified)
+        return methods
+
+    def targets(self, module: _Module) -> list[Target]:
+        targets = []
+        for node in module.tree.body:
+            if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef) and self.injects(module, node):
+                targets.append((node.name,))
+            elif isinstance(node, ast.ClassDef):
+                for name, method in self.methods(module, node).items():
+                    if self.injects(*method):
+                        targets.append((node.name, name))
+        return targets
+
+
+def analyse(packages: Iterable[str], path: Sequence[str | os.PathLike] | None = None) -> Index:
+    """
+    Find the functions and methods needing wiring by parsing module sources, without importing any module.
+
+    A default argument is recognised as a `Provider` if it constructs a provider (or a subclass defined in an analysed
+    module), or refers to a module level name or class attribute (e.g. of a `Container`) assigned one, following
+    imports between the analysed modules. Defaults that can only be determined at runtime (e.g. returned by a helper
+    function, or defined in a module that is not analysed) are not found, wire those modules without the index.
+
+    :param packages: dotted names of the modules or packages (including all submodules) to analyse.
+    :param path: directories to search for the top level packages, defaults to `sys.path`.
+    :return: the index of every analysed module.
+    """
+    modules = {}
+    for package in packages:
+        for name, file in find_modules(package, path).items():
+            try:
+                tree = ast.parse(file.read_bytes(), filename=os.fspath(file))
+            except SyntaxError:
+                continue
+            modules[name] = _Module(name, tree, file.name == "__init__.py")
+
+    analyser = _Analyser(modules)
+    return Index({name: analyser.targets(module) for name, module in modules.items()})
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m scottzach1.pif.analysis",
+        description="Report the functions and methods needing wiring, without importing any module.",
+    )
+    parser.add_argument("packages", nargs="+", help="dotted names of the modules or packages to analyse.")
+    parser.add_argument("-p", "--path", action="append", help="directory to search for packages, defaults to sys.path.")
+    parser.add_argument("-o", "--output", type=Path, help="write the index as JSON to this file.")
+    args = parser.parse_args(argv)
+
+    try:
+        index = analyse(args.packages, args.path)
+    except ModuleNotFoundError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    if args.output:
+        index.save(args.output)
+    for name in index.modules:
+        print(name)
+        for target in index.targets[name]:
+            print(f"    {'.'.join(target)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#                  _   _                 _     _
+#    ___  ___ ___ | |_| |_ ______ _  ___| |__ / |
+#   / __|/ __/ _ \| __| __|_  / _` |/ __| '_ \| |
+#   \__ \ (_| (_) | |_| |_ / / (_| | (__| | | | |
+#   |___/\___\___/ \__|\__/___\__,_|\___|_| |_|_|
+#
+#        Zac Scott (github.com/scottzach1)
+#
+#  https://github.com/scottzach1/python-injector-framework
+
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import types
+from pathlib import Path
+
+__all__ = ("WiringCache",)
+
+Target = tuple[str, ...]
+
+
+class WiringCache:
+    """
+    A persistent on-disk cache of which functions and methods in a module need wiring.
+
+    Entries are keyed by the module file path, its modification time and size, and the Python implementation. Modules
+    without a source file on disk (builtins, namespace packages, dynamically created modules) are never cached.
+
+    Note that the cache only tracks changes to the module itself, if a default argument is imported from another module
+    that stops (or starts) being a `Provider` then clear the cache.
+    """
+
+    __slots__ = ("directory",)
+
+    VERSION = 1
+
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = Path(directory)
+
+    @staticmethod
+    def _key(module: types.ModuleType) -> dict | None:
+        if not (file := getattr(module, "__file__", None)):
+            return None
+        try:
+            stat = os.stat(file)
+        except OSError:
+            return None
+        return {
+            "version": WiringCache.VERSION,
+            "python": sys.implementation.cache_tag,
+            "path": os.path.abspath(file),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+
+    def _path(self, module: types.ModuleType) -> Path:
+        digest = hashlib.sha1(module.__name__.encode(), usedforsecurity=False).hexdigest()[:16]
+        return self.directory / f"{module.__name__}.{digest}.json"
+
+    def get(self, module: types.ModuleType) -> list[Target] | None:
+        """
+        Get the cached wiring targets for a module.
+
+        :param module: to lookup.
+        :return: the attribute paths to wire, or None if there is no valid entry.
+        """
+        if (key := self._key(module)) is None:
+            return None
+        try:
+            entry = json.loads(self._path(module).read_text())
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key:
+            return None
+        return [tuple(target) for target in entry["targets"]]
+
+    def set(self, module: types.ModuleType, targets: list[Target]) -> None:
+        """
+        Store the wiring targets for a module. Failing to write the cache is never an error.
+
+        :param module: the targets were found in.
+        :param targets: attribute paths relative to the module, e.g. `("func",)` or `("Class", "method")`.
+        """
+        if (key := self._key(module)) is None:
+            return
+        with contextlib.suppress(OSError):
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump({"key": key, "targets": targets}, f)
+                os.replace(tmp, self._path(module))
+            except OSError:
+                os.unlink(tmp)
+                raise
+
+    def clear(self) -> None:
+        """
+        Remove all cached entries.
+        """
+        for path in self.directory.glob("*.json"):
+            with contextlib.suppress(OSError):
+                path.unlink()
@@ -0,0 +1,166 @@
+#                  _   _                 _     _
+#    ___  ___ ___ | |_| |_ ______ _  ___| |__ / |
+#   / __|/ __/ _ \| __| __|_  / _` |/ __| '_ \| |
+#   \__ \ (_| (_) | |_| |_ / / (_| | (__| | | | |
+#   |___/\___\___/ \__|\__/___\__,_|\___|_| |_|_|
+#
+#        Zac Scott (github.com/scottzach1)
+#
+#  https://github.com/scottzach1/python-injector-framework
+
+from __future__ import annotations
+
+import contextlib
+from collections.abc import Mapping
+from typing import Any, ClassVar
+
+from scottzach1.pif.providers.existing_singleton import ExistingSingleton
+from scottzach1.pif.providers.provider import LocalOverride, Provider
+
+__all__ = ("Container", "Overrides", "LocalOverrides", "Snapshot")
+
+
+class Overrides(contextlib.ExitStack):
+    """
+    A context manager disabling a group of overrides (in reverse order) on exit.
+    """
+
+    def disable(self) -> None:
+        """
+        Disable all the overrides.
+        """
+        self.close()
+
+
+class LocalOverrides:
+    """
+    A context manager entering a group of local overrides, and exiting them (in reverse order) on exit.
+    """
+
+    __slots__ = ("_overrides", "_stack")
+
+    def __init__(self, overrides: list[LocalOverride]):
+        self._overrides = overrides
+        self._stack = contextlib.ExitStack()
+
+    def __enter__(self) -> LocalOverrides:
+        with contextlib.ExitStack() as stack:
+            for override in self._overrides:
+                stack.enter_context(override)
+            self._stack = stack.pop_all()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self._stack.__exit__(exc_type, exc_val, exc_tb)
+
+
+class Snapshot:
+    """
+    The override and cached state of every provider in a container at a point in time.
+    """
+
+    __slots__ = ("_states",)
+
+    def __init__(self, states: dict[str, tuple[Provider | None, object]]):
+        self._states = states
+
+
+class Container:
+    """
+    Declaratively group providers as class attributes.
+
+    ```python
+    class Services(Container):
+        domain = providers.Blank()
+        client = providers.Singleton(ApiClient, domain=domain)
+    ```
+
+    Providers are collected from the class (and its bases) when it is defined, and are accessed as regular class
+    attributes. Containers are used directly and never instantiated, so avoid naming providers after the container
+    methods (e.g. `reset`).
+    """
+
+    providers: ClassVar[dict[str, Provider]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.providers = {
+            name: value
+            for klass in reversed(cls.__mro__)
+            for name, value in vars(klass).items()
+            if isinstance(value, Provider)
+        }
+
+    def __new__(cls, *args, **kwargs):
+        raise TypeError(f"{cls.__name__} is a container and cannot be instantiated.")
+
+    @classmethod
+    def _resolve(cls, key: str | Provider) -> Provider:
+        if isinstance(key, Provider):
+            return key
+        try:
+            return cls.providers[key]
+        except KeyError:
+            raise KeyError(f"{cls.__name__} has no provider {key!r}") from None
+
+    @classmethod
+    def override(cls, overrides: Mapping[str | Provider, Provider | None]) -> Overrides:
+        """
+        Override many providers at once, keyed by attribute name (or provider).
+
+        Like `Provider.override()` the overrides apply immediately, the returned context manager disables them all. If
+        any key is invalid no provider is overridden.
+        """
+        resolved = [(cls._resolve(key), provider) for key, provider in overrides.items()]
+        with Overrides() as stack:
+            for target, provider in resolved:
+                stack.enter_context(target.override(provider))
+            return stack.pop_all()
+
+    @classmethod
+    def override_existing(cls, values: Mapping[str | Provider, Any]) -> Overrides:
+        """
+        Override many providers at once with existing singletons, keyed by attribute name (or provider).
+        """
+        return cls.override({key: ExistingSingleton(value) for key, value in values.items()})
+
+    @classmethod
+    def local_override(cls, overrides: Mapping[str | Provider, Provider | None]) -> LocalOverrides:
+        """
+        Locally override many providers at once, see `Provider.local_override()`.
+
+        Unlike `override()` the overrides only apply once the returned context manager is entered.
+        """
+        return LocalOverrides([cls._resolve(key).local_override(provider) for key, provider in overrides.items()])
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Discard the cached state of every provider, see `Provider.reset()`.
+        """
+        for provider in cls.providers.values():
+            provider.reset()
+
+    @classmethod
+    def snapshot(cls) -> Snapshot:
+        """
+        Capture the (global) overrides and cached singleton instances of every provider.
+        """
+        # noinspection PyProtectedMember
+        return Snapshot({name: (p._global_override, p._snapshot()) for name, p in cls.providers.items()})
+
+    @classmethod
+    def restore(cls, snapshot: Snapshot) -> None:
+        """
+        Restore the state captured by `snapshot()`, only touching providers whose state has since changed.
+
+        Every override is restored before any cached state, as restoring an override discards the state of dependents.
+        """
+        # noinspection PyProtectedMember
+        for name, (override, _) in snapshot._states.items():
+            if (provider := cls.providers[name])._global_override is not override:
+                provider._set_global_override(override)
+        # noinspection PyProtectedMember
+        for name, (_, state) in snapshot._states.items():
+            if (provider := cls.providers[name])._snapshot() is not state:
+                provider._restore(state)
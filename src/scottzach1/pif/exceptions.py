@@ -20,3 +20,21 @@ class BlankProviderException(PifException):
     """
     Attempted to evaluate a BlankProvider. Make sure to override this first!
     """
+
+
+class CircularDependencyException(PifException):
+    """
+    Detected a cycle in the provider dependency graph.
+    """
+
+
+class NoActiveScopeException(PifException):
+    """
+    Attempted to evaluate a Scoped provider outside of a Scope. Make sure to enter a scope first!
+    """
+
+
+class PoolExhaustedException(PifException):
+    """
+    Timed out waiting for an instance to be returned to a Pool.
+    """
@@ -0,0 +1,299 @@
+#                  _   _                 _     _
+#    ___  ___ ___ | |_| |_ ______ _  ___| |__ / |
+#   / __|/ __/ _ \| __| __|_  / _` |/ __| '_ \| |
+#   \__ \ (_| (_) | |_| |_ / / (_| | (__| | | | |
+#   |___/\___\___/ \__|\__/___\__,_|\___|_| |_|_|
+#
+#        Zac Scott (github.com/scottzach1)
+#
+#  https://github.com/scottzach1/python-injector-framework
+
+import concurrent.futures
+import gc
+import importlib
+import inspect
+import itertools
+import keyword
+import threading
+import types
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, TypeVar
+
+from scottzach1.pif import exceptions, tracing
+from scottzach1.pif.providers.existing_singleton import ExistingSingleton
+from scottzach1.pif.providers.factory import Factory
+from scottzach1.pif.providers.provider import Provider, _Version
+from scottzach1.pif.providers.singleton import UNSET, Singleton, ThreadMode
+from scottzach1.pif.providers.util import executor
+
+__all__ = ("edges", "build_graph", "warm_up", "prefork", "flatten")
+
+T = TypeVar("T")
+Graph = dict[Provider, tuple[Provider, ...]]
+
+FLATTEN_LIMIT = 1000
+"""The number of factories inlined into a single flattened resolver, any further factories are simply called."""
+
+
+def edges(provider: Provider) -> tuple[Provider, ...]:
+    """
+    Get the providers evaluated when `provider` is evaluated.
+
+    An overridden provider only depends on its override (in the current context).
+
+    :param provider: to inspect.
+    :return: the direct dependencies.
+    """
+    # noinspection PyProtectedMember
+    if override := provider._current_override():
+        return (override,)
+    return provider.dependencies
+
+
+def _module_providers(module: types.ModuleType) -> Iterator[Provider]:
+    """
+    Find all providers defined at the top level of a module, or used as default arguments of its functions and methods.
+    """
+
+    def defaults(func) -> Iterator[Provider]:
+        func = getattr(func, "_patched_func", func)
+        for value in (*(func.__defaults__ or ()), *(func.__kwdefaults__ or {}).values()):
+            if isinstance(value, Provider):
+                yield value
+
+    for obj in vars(module).values():
+        if isinstance(obj, Provider):
+            yield obj
+        elif inspect.isfunction(obj):
+            yield from defaults(obj)
+        elif inspect.isclass(obj):
+            for method in vars(obj).values():
+                if inspect.isfunction(method):
+                    yield from defaults(method)
+
+
+def build_graph(roots: Iterable[Provider | types.ModuleType | str]) -> Graph:
+    """
+    Build the dependency graph of all providers reachable from `roots`.
+
+    Modules (or module names) contribute their top level providers and any provider default arguments.
+
+    :param roots: to start from.
+    :return: each provider mapped to its dependencies, ordered such that dependencies precede their dependents.
+    """
+    graph: Graph = {}
+    visiting: set[Provider] = set()
+
+    def visit(provider: Provider) -> None:
+        if provider in graph:
+            return
+        if provider in visiting:
+            raise exceptions.CircularDependencyException(f"Circular dependency detected at {provider!r}")
+
+        visiting.add(provider)
+        deps = edges(provider)
+        for dep in deps:
+            visit(dep)
+        visiting.discard(provider)
+        graph[provider] = deps
+
+    for root in roots:
+        if isinstance(root, str):
+            root = importlib.import_module(root)
+        if isinstance(root, types.ModuleType):
+            for provider in _module_providers(root):
+                visit(provider)
+        else:
+            visit(root)
+
+    return graph
+
+
+def _is_warmable(provider: Provider) -> bool:
+    # noinspection PyProtectedMember
+    return isinstance(provider, Singleton) and provider._thread_mode is not ThreadMode.PER_THREAD
+
+
+def warm_up(roots: Iterable[Provider | types.ModuleType | str], parallel: bool = True) -> list[Provider]:
+    """
+    Eagerly evaluate every singleton reachable from `roots` in dependency order.
+
+    When `parallel` is set, independent branches of the graph are evaluated concurrently on the shared thread pool.
+    Per-thread singletons are skipped as there is no thread to warm them for.
+
+    :param roots: to start from, see `build_graph`.
+    :param parallel: evaluate independent singletons concurrently.
+    :return: the singletons that were evaluated.
+    """
+    graph = build_graph(roots)
+    warmable = [p for p in graph if _is_warmable(p)]
+
+    if not parallel:
+        for provider in warmable:
+            provider()
+        return warmable
+
+    dependents: dict[Provider, list[Provider]] = {p: [] for p in graph}
+    remaining = {p: len(deps) for p, deps in graph.items()}
+    for provider, deps in graph.items():
+        for dep in deps:
+            dependents[dep].append(provider)
+
+    def evaluate(provider: Provider) -> Provider:
+        if _is_warmable(provider):
+            provider()
+        return provider
+
+    pool = executor()
+    pending = {pool.submit(evaluate, p) for p, count in remaining.items() if not count}
+    try:
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                for dependent in dependents[future.result()]:
+                    remaining[dependent] -= 1
+                    if not remaining[dependent]:
+                        pending.add(pool.submit(evaluate, dependent))
+    finally:
+        concurrent.futures.wait(pending)
+
+    return warmable
+
+
+def prefork(roots: Iterable[Provider | types.ModuleType | str], freeze: bool = False) -> list[Provider]:
+    """
+    Eagerly evaluate every fork safe singleton reachable from `roots`, before forking worker processes.
+
+    The workers then inherit the instances rather than each constructing their own, sharing their memory (copy on
+    write) until modified. Singletons that are not `fork_safe`, or (transitively) depend on one, are skipped as the
+    workers discard them anyway. Evaluation is sequential so no threads are started before forking.
+
+    :param roots: to start from, see `build_graph`.
+    :param freeze: call `gc.freeze()` afterwards, so the garbage collector never writes to (and copies) the pages
+        holding the instances in the workers.
+    :return: the singletons that were evaluated.
+    """
+    graph = build_graph(roots)
+    unsafe: set[Provider] = set()
+    evaluated = []
+    for provider, deps in graph.items():
+        # noinspection PyProtectedMember
+        if (isinstance(provider, Singleton) and not provider._fork_safe) or any(dep in unsafe for dep in deps):
+            unsafe.add(provider)
+        elif _is_warmable(provider):
+            provider()
+            evaluated.append(provider)
+
+    if freeze:
+        gc.freeze()
+    return evaluated
+
+
+def _inlinable(provider: Factory) -> bool:
+    # noinspection PyProtectedMember
+    return not provider._parallel and all(k.isidentifier() and not keyword.iskeyword(k) for k in provider._spec[2])
+
+
+def _compile_resolver(root: Provider, version: _Version, stale: Callable[[], Any]) -> Callable[[], Any]:
+    """
+    Generate a function evaluating `root` with its dependency tree inlined as straight line code.
+
+    Factories are inlined as direct calls to their `func`, singletons read their cached instance (only calling the
+    singleton to construct it, or while any dependency is locally overridden), and existing singletons read their
+    instance. Any other or overridden provider is simply called. Every provider in the tree is watched by `version`,
+    the generated function calls `stale` instead once any of their overrides have changed, or while any
+    `tracing.Tracer` is registered.
+    """
+    namespace: dict[str, Any] = {
+        "_UNSET": UNSET,
+        "_hooks": tracing.hooks,
+        "_stale": stale,
+        "_version": version,
+        "_seen": version.value,
+    }
+    names: dict[int, str] = {}
+    lines: list[str] = []
+    temps = itertools.count()
+    inlined = itertools.count()
+
+    def constant(value: Any) -> str:
+        if (name := names.get(id(value))) is None:
+            name = names[id(value)] = f"_c{len(names)}"
+            namespace[name] = value
+        return name
+
+    def emit(provider: Provider) -> str:
+        ref, local = constant(provider), f"_t{next(temps)}"
+        # noinspection PyProtectedMember
+        provider._watch(version)
+        # noinspection PyProtectedMember
+        if provider._override is not None:
+            lines.append(f"{local} = {ref}()")
+        elif type(provider) is Singleton:
+            lines.extend(
+                (
+                    f"{local} = {ref}._result",
+                    f"if {local} is _UNSET or {ref}._local_upstream:",
+                    f"    {local} = {ref}()",
+                )
+            )
+        elif type(provider) is ExistingSingleton:
+            lines.append(f"{local} = {ref}.t")
+        elif type(provider) is Factory and _inlinable(provider) and next(inlined) < FLATTEN_LIMIT:
+            # noinspection PyProtectedMember
+            func, args, kwargs = provider._spec
+            values = [emit(v) if isinstance(v, Provider) else constant(v) for v in args]
+            values += [f"{k}={emit(v) if isinstance(v, Provider) else constant(v)}" for k, v in kwargs.items()]
+            lines.append(f"{local} = {constant(func)}({', '.join(values)})")
+        else:
+            lines.append(f"{local} = {ref}()")
+        return local
+
+    result = emit(root)
+    source = "\n".join(
+        (
+            "def resolve():",
+            "    if _version.value != _seen or _hooks.tracers:",
+            "        return _stale()",
+            *(f"    {line}" for line in lines),
+            f"    return {result}",
+        )
+    )
+    exec(compile(source, f"<pif-flatten {root!r}>", "exec"), namespace)
+    return namespace["resolve"]
+
+
+def flatten(root: Provider[T]) -> Callable[[], T]:
+    """
+    Compile `root` into a single resolver function with its whole dependency tree inlined.
+
+    Evaluating a chain of factories costs one function call plus the constructors themselves, rather than several
+    frames per provider. Singletons are still constructed (once) by the singleton itself, after which their cached
+    instance is read directly.
+
+    The function is regenerated on its next call after any provider in the tree is (globally or locally) overridden
+    or the override is removed, overridden providers are simply called. While any `tracing.Tracer` is registered the
+    function evaluates `root` as usual so every provider is reported.
+
+    :param root: to compile.
+    :return: a function evaluating `root`.
+    """
+    version = _Version()
+    lock = threading.Lock()
+
+    def stale() -> T:
+        nonlocal compiled, resolver
+        if tracing.hooks.tracers:
+            return root()
+        with lock:
+            if compiled != version.value:
+                compiled = version.value
+                resolver = _compile_resolver(root, version, stale)
+        return resolver()
+
+    def resolve() -> T:
+        return resolver()
+
+    compiled = version.value
+    resolver = _compile_resolver(root, version, stale)
+    return resolve
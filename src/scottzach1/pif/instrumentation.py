@@ -0,0 +1,190 @@
+#                  _   _                 _     _
+#    ___  ___ ___ | |_| |_ ______ _  ___| |__ / |
+#   / __|/ __/ _ \| __| __|_  / _` |/ __| '_ \| |
+#   \__ \ (_| (_) | |_| |_ / / (_| | (__| | | | |
+#   |___/\___\___/ \__|\__/___\__,_|\___|_| |_|_|
+#
+#        Zac Scott (github.com/scottzach1)
+#
+#  https://github.com/scottzach1/python-injector-framework
+
+import bisect
+import contextlib
+import threading
+import weakref
+from collections.abc import Iterator
+from typing import Any
+
+from scottzach1.pif import tracing
+from scottzach1.pif.providers.provider import Provider
+from scottzach1.pif.providers.singleton import UNSET, Singleton, ThreadMode
+
+__all__ = ("enable", "disable", "is_enabled", "instrumented", "snapshot", "reset")
+
+BUCKETS_NS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000, 1_000_000_000)
+"""Upper bounds (inclusive) of the latency histogram buckets, the last bucket is unbounded."""
+
+_NOT_CACHING = object()
+_stats: "weakref.WeakKeyDictionary[Provider, _Stats]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+_local = threading.local()
+
+
+class _Stats:
+    """
+    Mutable counters for a single provider, only ever updated while holding `_lock`.
+    """
+
+    __slots__ = (
+        "calls",
+        "errors",
+        "overridden",
+        "hits",
+        "misses",
+        "max_depth",
+        "total_ns",
+        "min_ns",
+        "max_ns",
+        "buckets",
+    )
+
+    def __init__(self):
+        self.calls = self.errors = self.overridden = self.hits = self.misses = self.max_depth = self.total_ns = 0
+        self.min_ns: int | None = None
+        self.max_ns = 0
+        self.buckets = [0] * (len(BUCKETS_NS) + 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "overridden": self.overridden,
+            "hits": self.hits,
+            "misses": self.misses,
+            "max_depth": self.max_depth,
+            "latency_ns": {
+                "total": self.total_ns,
+                "min": self.min_ns,
+                "max": self.max_ns,
+                "buckets": dict(zip((*BUCKETS_NS, None), self.buckets, strict=True)),
+            },
+        }
+
+
+def _is_cached(provider: Provider) -> bool | None:
+    """
+    Check if a caching provider already holds its value, or None if the provider does not cache.
+    """
+    if (result := getattr(provider, "_result", _NOT_CACHING)) is _NOT_CACHING:
+        return None
+    # noinspection PyProtectedMember
+    if isinstance(provider, Singleton) and provider._thread_mode is ThreadMode.PER_THREAD:
+        return getattr(provider._local, "result", UNSET) is not UNSET
+    return result is not UNSET
+
+
+class _InstrumentationTracer(tracing.Tracer):
+    """
+    Records provider evaluations into the per provider statistics.
+    """
+
+    __slots__ = ()
+
+    def enter(self, kind: str, target: Any) -> Any:
+        if kind != tracing.PROVIDER:
+            return None
+        depth = getattr(_local, "depth", 0) + 1
+        _local.depth = depth
+        return depth, None if target._override else _is_cached(target)
+
+    def exit(self, kind: str, target: Any, state: Any, elapsed_ns: int, error: BaseException | None) -> None:
+        if state is None:
+            return
+        depth, cached = state
+        _local.depth = depth - 1
+
+        with _lock:
+            if (stats := _stats.get(target)) is None:
+                stats = _stats[target] = _Stats()
+            stats.calls += 1
+            stats.errors += error is not None
+            stats.overridden += bool(target._override)
+            stats.hits += cached is True
+            stats.misses += cached is False
+            stats.max_depth = max(stats.max_depth, depth)
+            stats.total_ns += elapsed_ns
+            stats.min_ns = elapsed_ns if stats.min_ns is None else min(stats.min_ns, elapsed_ns)
+            stats.max_ns = max(stats.max_ns, elapsed_ns)
+            stats.buckets[bisect.bisect_left(BUCKETS_NS, elapsed_ns)] += 1
+
+
+_tracer = _InstrumentationTracer()
+
+
+def enable() -> None:
+    """
+    Start recording per provider statistics.
+
+    Recording is implemented as a `tracing.Tracer`, while no tracers are registered instrumentation costs nothing.
+    """
+    tracing.add_tracer(_tracer)
+
+
+def disable() -> None:
+    """
+    Stop recording per provider statistics. Statistics recorded so far are kept until `reset()`.
+    """
+    tracing.remove_tracer(_tracer)
+
+
+def is_enabled() -> bool:
+    """
+    Check if per provider statistics are being recorded.
+    """
+    return _tracer in tracing.hooks.tracers
+
+
+@contextlib.contextmanager
+def instrumented() -> Iterator[None]:
+    """
+    Enable instrumentation for the duration of the context.
+    """
+    was_enabled = is_enabled()
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def snapshot(reset: bool = False) -> list[dict[str, Any]]:
+    """
+    Get the statistics recorded for each provider as plain dicts, ready for export.
+
+    Latency for async providers only covers creating the awaitable, not awaiting it.
+
+    :param reset: clear the statistics once read.
+    :return: a dict per provider with its `id`, `provider` label, `type` and counters.
+    """
+    with _lock:
+        result = [
+            {
+                "id": id(provider),
+                "provider": tracing.describe(provider),
+                "type": type(provider).__name__,
+                **stats.as_dict(),
+            }
+            for provider, stats in _stats.items()
+        ]
+        if reset:
+            _stats.clear()
+    return result
+
+
+def reset() -> None:
+    """
+    Clear all recorded statistics.
+    """
+    with _lock:
+        _stats.clear()
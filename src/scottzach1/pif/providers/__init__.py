@@ -1,6 +1,13 @@
 # isort: skip_file
-from scottzach1.pif.providers.provider import Provider
+from scottzach1.pif.providers.provider import Provider, Override, LocalOverride
 from scottzach1.pif.providers.blank import Blank
 from scottzach1.pif.providers.existing_singleton import ExistingSingleton
 from scottzach1.pif.providers.factory import Factory
-from scottzach1.pif.providers.singleton import Singleton
+from scottzach1.pif.providers.singleton import Singleton, ThreadMode, Invalidation
+from scottzach1.pif.providers.async_factory import AsyncFactory
+from scottzach1.pif.providers.async_singleton import AsyncSingleton
+from scottzach1.pif.providers.scoped import Scope, Scoped
+from scottzach1.pif.providers.resource import Resource
+from scottzach1.pif.providers.pool import Pool
+from scottzach1.pif.providers.cached import Cached
+from scottzach1.pif.providers.multiton import Multiton
@@ -0,0 +1,38 @@
+#                  _   _                 _     _
+#    ___  ___ ___ | |_| |_ ______ _  ___| |__ / |
+#   / __|/ __/ _ \| __| __|_  / _` |/ __| '_ \| |
+#   \__ \ (_| (_) | |_| |_ / / (_| | (__| | | | |
+#   |___/\___\___/ \__|\__/___\__,_|\___|_| |_|_|
+#
+#        Zac Scott (github.com/scottzach1)
+#
+#  https://github.com/scottzach1/python-injector-framework
+
+import functools
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from scottzach1.pif.providers.provider import Provider
+from scottzach1.pif.providers.util import async_intercept_args, dependencies
+
+__all__ = ("AsyncFactory",)
+
+T = TypeVar("T")
+
+
+class AsyncFactory(Provider[Awaitable[T]]):
+    """
+    Generate a new instance every call, asynchronously.
+
+    Evaluating the provider returns an awaitable. Any Provider arguments are evaluated and awaited concurrently before
+    `func` is called (and awaited if it returns an awaitable).
+    """
+
+    __slots__ = ("_func", "_depends")
+
+    def __init__(self, func: Callable[..., T | Awaitable[T]], /, *args, **kwargs):
+        self._func = functools.partial(async_intercept_args(func), *args, **kwargs)
+        self._set_dependencies(dependencies(*args, **kwargs))
+
+    def _evaluate(self) -> Awaitable[T]:
+        return self._func()
@@ -0,0 +1,92 @@
+#                  _   _                 _     _
+#    ___  ___ ___ | |_| |_ ______ _  ___| |__ / |
+#   / __|/ __/ _ \| __| __|_  / _` |/ __| '_ \| |
+#   \__ \ (_| (_) | |_| |_ / / (_| | (__| | | | |
+#   |___/\___\___/ \__|\__/___\__,_|\___|_| |_|_|
+#
+#        Zac Scott (github.com/scottzach1)
+#
+#  https://github.com/scottzach1/python-injector-framework
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, TypeVar
+
+from scottzach1.pif.providers.provider import Provider
+from scottzach1.pif.providers.singleton import UNSET
+from scottzach1.pif.providers.util import async_intercept_args, dependencies
+
+if TYPE_CHECKING:
+    import asyncio
+
+__all__ = ("AsyncSingleton",)
+
+T = TypeVar("T")
+
+
+class AsyncSingleton(Provider[Awaitable[T]]):
+    """
+    Provide a singleton instance, asynchronously.
+
+    Evaluating the provider returns an awaitable. Concurrent awaits during the first evaluation share a single
+    construction, if it fails the next evaluation will try again.
+
+    Globally overriding any (transitive) provider argument discards the instance. While any (transitive) provider
+    argument is locally overridden in the current context a new instance is constructed and never cached.
+    """
+
+    __slots__ = ("_func", "_result", "_future", "_depends")
+
+    def __init__(self, func: Callable[..., T | Awaitable[T]], /, *args, **kwargs):
+        self._func = functools.partial(async_intercept_args(func), *args, **kwargs)
+        self._set_dependencies(dependencies(*args, **kwargs))
+        self._result = UNSET
+        self._future: asyncio.Future | None = None
+
+    def _resolved(self, future: asyncio.Future) -> None:
+        if future is not self._future:
+            return  # Reset while constructing.
+        if future.cancelled() or future.exception() is not None:
+            self._future = None
+        else:
+            self._result = future.result()
+
+    async def _evaluate(self) -> T:
+        if (result := self._result) is not UNSET and not self._local_upstream:
+            return result
+
+        if self._local_upstream and self._locally_overridden():
+            return await self._func()
+        if result is not UNSET:
+            return result
+
+        import asyncio  # Only imported once needed, as it is slow to import.
+
+        if (future := self._future) is None:
+            future = self._future = asyncio.ensure_future(self._func())
+            future.add_done_callback(self._resolved)
+
+        # Shield the shared construction so cancelling one awaiter does not cancel it for the others.
+        return await asyncio.shield(future)
+
+    def reset(self) -> None:
+        """
+        Discard the instance, the next evaluation will construct a new one.
+        """
+        self._result = UNSET
+        self._future = None
+
+    def _upstream_overridden(self) -> None:
+        self.reset()
+
+    def _forked(self) -> None:
+        self.reset()
+
+    def _snapshot(self) -> object:
+        return self._result
+
+    def _restore(self, state: object) -> None:
+        self._result = state
+        self._future = None
@@ -0,0 +1,138 @@
+#                  _   _                 _     _
+#    ___  ___ ___ | |_| |_ ______ _  ___| |__ / |
+#   / __|/ __/ _ \| __| __|_  / _` |/ __| '_ \| |
+#   \__ \ (_| (_) | |_| |_ / / (_| | (__| | | | |
+#   |___/\___\___/ \__|\__/___\__,_|\___|_| |_|_|
+#
+#        Zac Scott (github.com/scottzach1)
+#
+#  https://github.com/scottzach1/python-injector-framework
+
+import collections
+import concurrent.futures
+import threading
+import time
+from collections.abc import Callable, Hashable
+from typing import TypeVar
+
+from scottzach1.pif.providers.provider import Provider
+from scottzach1.pif.providers.util import bind, check_reserved, dependencies, executor
+
+__all__ = ("Cached",)
+
+T = TypeVar("T")
+
+_KWARGS = object()
+"""Separates the args and kwargs of a cache key, like `functools.lru_cache`, so args never collide with kwargs."""
+
+
+class _Entry:
+    __slots__ = ("value", "expires")
+
+    def __init__(self, value, expires: float):
+        self.value = value
+        self.expires = expires
+
+
+class Cached(Provider[T]):
+    """
+    Provide a memoized instance that is reconstructed once it expires.
+
+    Args and kwargs supplied when evaluating the provider are appended to those bound at construction, each distinct
+    combination (which must be hashable) is cached separately. At most `cache_size` combinations are kept, evicting the
+    least recently used.
+
+    Instances expire `cache_ttl` seconds after construction (or never when None). For a further `cache_stale` seconds
+    the expired instance is still provided while a replacement is constructed in the background on the shared thread
+    pool. Concurrent evaluations never construct the same combination more than once at a time.
+
+    The `cache_ttl`, `cache_size` and `cache_stale` keywords are reserved and never forwarded to `func`, which must not
+    take them.
+    """
+
+    __slots__ = ("_func", "_depends", "_ttl", "_size", "_stale", "_entries", "_inflight", "_lock")
+
+    _parameterized = True
+
+    def __init__(
+        self,
+        func: Callable[..., T],
+        /,
+        *args,
+        cache_ttl: float | None = None,
+        cache_size: int = 128,
+        cache_stale: float = 0,
+        **kwargs,
+    ):
+        check_reserved(Cached, func, "cache_ttl", "cache_size", "cache_stale")
+        if cache_size < 1:
+            raise ValueError(f"cache_size must be at least 1, got {cache_size}")
+
+        self._func = bind(func, args, kwargs)
+        self._set_dependencies(dependencies(*args, **kwargs))
+        self._ttl = float("inf") if cache_ttl is None else cache_ttl
+        self._size = cache_size
+        self._stale = cache_stale
+        self._entries: collections.OrderedDict[Hashable, _Entry] = collections.OrderedDict()
+        self._inflight: dict[Hashable, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+
+    def _evaluate(self, *args, **kwargs) -> T:
+        key = (*args, _KWARGS, *sorted(kwargs.items())) if kwargs else args
+        now = time.monotonic()
+
+        with self._lock:
+            if (entry := self._entries.get(key)) is not None:
+                self._entries.move_to_end(key)
+                if now < entry.expires:
+                    return entry.value
+                if now < entry.expires + self._stale:
+                    if key not in self._inflight:
+                        future = self._inflight[key] = concurrent.futures.Future()
+                        executor().submit(self._load, key, args, kwargs, future)
+                    return entry.value
+
+            future = self._inflight.get(key)
+            if leader := future is None:
+                future = self._inflight[key] = concurrent.futures.Future()
+
+        if not leader:
+            return future.result()
+        return self._load(key, args, kwargs, future)
+
+    def _load(self, key: Hashable, args: tuple, kwargs: dict, future: concurrent.futures.Future) -> T:
+        """
+        Construct the instance for `key`, resolving `future` for any concurrent evaluations waiting on it.
+        """
+        try:
+            value = self._func(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            if self._inflight.get(key) is future:  # Otherwise reset while constructing.
+                del self._inflight[key]
+                self._entries[key] = _Entry(value, time.monotonic() + self._ttl)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._size:
+                    self._entries.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    def reset(self) -> None:
+        """
+        Discard all cached instances, the next evaluations will construct new ones.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._inflight.clear()
+
+    def _upstream_overridden(self) -> None:
+        self.reset()
+
+    def _forked(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
@@ -19,12 +19,16 @@ T = TypeVar("T")
 class ExistingSingleton(Provider):
     """
     Provide an existing object instance.
+
+    Any args and kwargs are ignored, so an existing instance can override parameterized providers.
     """
 
     __slots__ = ("t",)
 
+    _parameterized = True
+
     def __init__(self, t: T):
         self.t = t
 
-    def _evaluate(self) -> T:
+    def _evaluate(self, *args, **kwargs) -> T:
         return self.t
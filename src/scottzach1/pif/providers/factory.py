@@ -13,7 +13,7 @@ from collections.abc import Callable
 from typing import TypeVar
 
 from scottzach1.pif.providers.provider import Provider
-from scottzach1.pif.providers.util import intercept_args
+from scottzach1.pif.providers.util import bind, check_reserved, dependencies, intercept_args, parallel_intercept_args
 
 __all__ = ("Factory",)
 
@@ -23,12 +23,32 @@ T = TypeVar("T")
 class Factory(Provider):
     """
     Generate a new instance every call.
+
+    When `factory_parallel` is set, any Provider arguments are evaluated concurrently on a shared thread pool. The
+    `factory_parallel` keyword is reserved and never forwarded to `func`, which must not take it.
     """
 
-    __slots__ = ("_func", "_depends")
+    __slots__ = ("_func", "_spec", "_parallel", "_depends")
 
-    def __init__(self, func: Callable[..., T], *args, **kwargs):
-        self._func = functools.partial(intercept_args(func), *args, **kwargs)
+    def __init__(self, func: Callable[..., T], /, *args, factory_parallel: bool = False, **kwargs):
+        check_reserved(Factory, func, "factory_parallel")
+        if factory_parallel:
+            self._func = functools.partial(parallel_intercept_args(func), *args, **kwargs)
+        else:
+            self._func = bind(func, args, kwargs)
+        self._spec = (func, args, kwargs)
+        self._parallel = factory_parallel
+        self._set_dependencies(dependencies(*args, **kwargs))
 
     def _evaluate(self) -> T:
         return self._func()
+
+    def _batch(self) -> Callable[..., T]:
+        func, args, kwargs = self._spec
+        resolve = (parallel_intercept_args if self._parallel else intercept_args)(_arguments)
+        args, kwargs = resolve(*args, **kwargs)
+        return functools.partial(func, *args, **kwargs)
+
+
+def _arguments(*args, **kwargs) -> tuple[tuple, dict]:
+    return args, kwargs
@@ -0,0 +1,108 @@
+#                  _   _                 _     _
+#    ___  ___ ___ | |_| |_ ______ _  ___| |__ / |
+#   / __|/ __/ _ \| __| __|_  / _` |/ __| '_ \| |
+#   \__ \ (_| (_) | |_| |_ / / (_| | (__| | | | |
+#   |___/\___\___/ \__|\__/___\__,_|\___|_| |_|_|
+#
+#        Zac Scott (github.com/scottzach1)
+#
+#  https://github.com/scottzach1/python-injector-framework
+
+import contextvars
+import threading
+from collections.abc import Callable, Hashable
+from typing import TypeVar
+
+from scottzach1.pif.providers.provider import Provider
+from scottzach1.pif.providers.singleton import UNSET
+from scottzach1.pif.providers.util import bind, check_reserved, dependencies
+
+__all__ = ("Multiton",)
+
+T = TypeVar("T")
+
+
+class Multiton(Provider[T]):
+    """
+    Provide one instance per key, e.g. per region or tenant.
+
+    The key is supplied when evaluating the provider, `provider("us-east-1")`, or read from the `multiton_key` context
+    variable when omitted (such as when injected). It is appended to the args bound at construction when calling `func`.
+
+    At most `multiton_size` instances are kept (or unbounded when None), evicting the oldest constructed first, so
+    looking up an existing instance is a single dict hit.
+
+    The `multiton_key` and `multiton_size` keywords are reserved and never forwarded to `func`, which must not take
+    them.
+    """
+
+    __slots__ = ("_func", "_depends", "_key", "_size", "_instances", "_locks", "_lock")
+
+    _parameterized = True
+
+    def __init__(
+        self,
+        func: Callable[..., T],
+        /,
+        *args,
+        multiton_key: contextvars.ContextVar[Hashable] | None = None,
+        multiton_size: int | None = None,
+        **kwargs,
+    ):
+        check_reserved(Multiton, func, "multiton_key", "multiton_size")
+        if multiton_size is not None and multiton_size < 1:
+            raise ValueError(f"multiton_size must be at least 1, got {multiton_size}")
+
+        self._func = bind(func, args, kwargs)
+        self._set_dependencies(dependencies(*args, **kwargs))
+        self._key = multiton_key
+        self._size = multiton_size
+        self._instances: dict[Hashable, T] = {}
+        self._locks: dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _evaluate(self, key: Hashable = UNSET) -> T:
+        if key is UNSET:
+            if self._key is None:
+                raise TypeError("Multiton requires a key, either when evaluated or from the multiton_key context var.")
+            key = self._key.get()
+
+        try:
+            return self._instances[key]
+        except KeyError:
+            pass
+
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+
+        with lock:
+            if (instance := self._instances.get(key, UNSET)) is UNSET:
+                instance = self._func(key)
+                with self._lock:
+                    self._instances[key] = instance
+                    self._locks.pop(key, None)
+                    if self._size is not None and len(self._instances) > self._size:
+                        del self._instances[next(iter(self._instances))]
+        return instance
+
+    def keys(self) -> list[Hashable]:
+        """
+        Get the keys of all instances currently held, oldest first.
+        """
+        with self._lock:
+            return list(self._instances)
+
+    def reset(self) -> None:
+        """
+        Discard all instances, the next evaluations will construct new ones.
+        """
+        with self._lock:
+            self._instances.clear()
+
+    def _upstream_overridden(self) -> None:
+        self.reset()
+
+    def _forked(self) -> None:
+        self._lock = threading.Lock()
+        self._locks = {}
+        self.reset()
@@ -0,0 +1,130 @@
+#                  _   _                 _     _
+#    ___  ___ ___ | |_| |_ ______ _  ___| |__ / |
+#   / __|/ __/ _ \| __| __|_  / _` |/ __| '_ \| |
+#   \__ \ (_| (_) | |_| |_ / / (_| | (__| | | | |
+#   |___/\___\___/ \__|\__/___\__,_|\___|_| |_|_|
+#
+#        Zac Scott (github.com/scottzach1)
+#
+#  https://github.com/scottzach1/python-injector-framework
+
+import contextlib
+import os
+import threading
+import weakref
+from collections.abc import Callable, Iterator
+from typing import TypeVar
+
+from scottzach1.pif import exceptions
+from scottzach1.pif.providers.provider import Provider
+from scottzach1.pif.providers.singleton import UNSET
+from scottzach1.pif.providers.util import bind, check_reserved, dependencies
+
+__all__ = ("Pool",)
+
+T = TypeVar("T")
+
+
+class Pool(Provider[T]):
+    """
+    Provide an instance checked out from a bounded pool of reusable instances.
+
+    At most `pool_size` instances are ever constructed, evaluating the provider while all of them are checked out will
+    block (for up to `pool_timeout` seconds) until one is returned with `release()`. When injected as a default argument
+    the instance is automatically returned once the injected function returns, otherwise prefer `checkout()`. A pool
+    cannot be an argument of another provider, or evaluated in batches with `many()` or `map()`, as nothing would return
+    its instances.
+
+    When the process forks, children start with an empty pool, as the instances checked out by the parent's threads
+    would never be returned.
+
+    The `pool_size` and `pool_timeout` keywords are reserved and never forwarded to `func`, which must not take them.
+    """
+
+    __slots__ = ("_func", "_depends", "_idle", "_busy", "_lock", "_available", "_size", "_timeout")
+
+    def __init__(
+        self,
+        func: Callable[..., T],
+        /,
+        *args,
+        pool_size: int = 8,
+        pool_timeout: float | None = None,
+        **kwargs,
+    ):
+        check_reserved(Pool, func, "pool_size", "pool_timeout")
+        if pool_size < 1:
+            raise ValueError(f"pool_size must be at least 1, got {pool_size}")
+
+        self._func = bind(func, args, kwargs)
+        self._set_dependencies(dependencies(*args, **kwargs))
+        self._idle: list[T] = []
+        self._busy: dict[int, T] = {}
+        self._lock = threading.Lock()
+        self._available = threading.BoundedSemaphore(pool_size)
+        self._size = pool_size
+        self._timeout = pool_timeout
+        _instances.add(self)
+
+    def _evaluate(self) -> T:
+        if not self._available.acquire(timeout=self._timeout):
+            raise exceptions.PoolExhaustedException()
+
+        with self._lock:
+            obj = self._idle.pop() if self._idle else UNSET
+
+        if obj is UNSET:
+            try:
+                obj = self._func()
+            except BaseException:
+                self._available.release()
+                raise
+
+        with self._lock:
+            self._busy[id(obj)] = obj
+        return obj
+
+    def release(self, obj: T) -> None:
+        """
+        Return a checked out instance to the pool. Objects that were not checked out from this pool are ignored.
+        """
+        with self._lock:
+            if self._busy.pop(id(obj), UNSET) is UNSET:
+                return
+            self._idle.append(obj)
+        self._available.release()
+
+    @contextlib.contextmanager
+    def checkout(self) -> Iterator[T]:
+        """
+        Evaluate the provider, returning the instance to the pool on exit.
+        """
+        obj = self()
+        try:
+            yield obj
+        finally:
+            self.release(obj)
+
+    def _batch(self) -> Callable[..., T]:
+        raise TypeError("A Pool cannot evaluate a batch, as nothing would return its instances, use checkout().")
+
+    def _forked(self) -> None:
+        self._lock = threading.Lock()
+        self._idle = []
+        self._busy = {}
+        self._available = threading.BoundedSemaphore(self._size)
+
+
+_instances: weakref.WeakSet[Pool] = weakref.WeakSet()
+
+
+def _after_fork_in_child() -> None:
+    """
+    Empty every pool, giving it a fresh lock and semaphore, as the parent's locks may be held at fork time.
+    """
+    for pool in list(_instances):
+        pool._forked()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -11,13 +11,33 @@
 from __future__ import annotations
 
 import abc
-from typing import Generic, TypeVar
+import concurrent.futures
+import contextvars
+import inspect
+import itertools
+import os
+import threading
+import weakref
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, Generic, TypeVar
 
-__all__ = ("Provider", "Override")
+__all__ = ("Provider", "Override", "LocalOverride")
 
 T = TypeVar("T")
 U = TypeVar("U")
 
+_INHERIT = object()
+_local_lock = threading.Lock()
+
+
+def _reset_local_lock() -> None:
+    global _local_lock
+    _local_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_local_lock)
+
 
 class Provider(abc.ABC, Generic[T]):
     """
@@ -25,23 +45,204 @@ class Provider(abc.ABC, Generic[T]):
     """
 
     _override: Provider | None = None
+    """The override consulted on every evaluation, a `_ContextOverride` while any local overrides are active."""
+    _global_override: Provider | None = None
+    _local_override: contextvars.ContextVar[Provider | None] | None = None
+    _local_count: int = 0
+    _depends: tuple[Provider, ...] = ()
+    _dependents: weakref.WeakSet[Provider] | None = None
+    _parameterized: bool = False
+    """Whether `_evaluate` accepts args and kwargs, they are only forwarded to an override if it is parameterized."""
+    _local_upstream: frozenset[Provider] = frozenset()
+    """The (transitive) dependencies with any active local overrides (in any context), see `_locally_overridden`."""
+    _versions: weakref.WeakSet[_Version] | None = None
+    """Incremented whenever the `_override` of this provider changes, see `_watch`."""
+
+    @property
+    def dependencies(self) -> tuple[Provider, ...]:
+        """
+        The providers this provider directly depends on (excluding any override).
+        """
+        return self._depends
+
+    def _set_dependencies(self, depends: tuple[Provider, ...]) -> None:
+        """
+        Record the providers this provider depends on, registering the reverse edges for invalidation.
+        """
+        self._depends = depends
+        with _local_lock:
+            for dep in depends:
+                dep._add_dependent(self)
+                self._local_upstream |= dep._local_upstream | ({dep} if dep._local_count else set())
+
+    def _add_dependent(self, provider: Provider) -> None:
+        if self._dependents is None:
+            self._dependents = weakref.WeakSet()
+        self._dependents.add(provider)
+
+    def _watch(self, version: _Version) -> None:
+        """
+        Increment `version` whenever the `_override` of this provider changes.
+        """
+        with _local_lock:
+            if self._versions is None:
+                self._versions = weakref.WeakSet()
+            self._versions.add(version)
+
+    def _override_changed(self) -> None:
+        for version in self._versions or ():
+            version.value += 1
+
+    def _transitive_dependents(self) -> Iterator[Provider]:
+        """
+        Yield every provider that (transitively) depends on this provider, once each.
+        """
+        seen: set[Provider] = set()
+        stack = [self]
+        while stack:
+            for dependent in list(stack.pop()._dependents or ()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    yield dependent
+                    stack.append(dependent)
+
+    def _invalidate_dependents(self) -> None:
+        """
+        Notify every provider that (transitively) depends on this provider that it has been overridden.
+        """
+        for dependent in self._transitive_dependents():
+            dependent._upstream_overridden()
+
+    def _locally_overridden(self) -> bool:
+        """
+        Whether any (transitive) dependency is locally overridden in the current context.
+        """
+        # noinspection PyProtectedMember
+        return any(p._local_override.get(_INHERIT) is not _INHERIT for p in self._local_upstream)
+
+    def _upstream_overridden(self) -> None:
+        """
+        Called when a (transitive) dependency has been globally overridden. Does nothing by default.
+        """
+
+    def _forked(self) -> None:
+        """
+        Called in a forked child process when a (transitive) dependency is a fork unsafe singleton. Does nothing by
+        default.
+        """
 
     def __call__(self, *args, **kwargs) -> T:
         """
         Evaluate the provider, will select override if present.
+
+        Any args and kwargs are forwarded to the evaluation, most providers do not accept any. An override only receives
+        them if it is parameterized itself, e.g. a `Multiton` overridden by a `Factory` evaluates the factory as usual.
         """
+        if args or kwargs:
+            return self._evaluate_with(args, kwargs)
+
         if self._override:
             return self._override()
 
         return self._evaluate()
 
+    def _evaluate_with(self, args: tuple, kwargs: dict[str, Any]) -> T:
+        if (override := self._current_override()) is None:
+            return self._evaluate(*args, **kwargs)
+        return override(*args, **kwargs) if override._parameterized else override()
+
     @abc.abstractmethod
-    def _evaluate(self) -> T:
+    def _evaluate(self, *args, **kwargs) -> T:
         """
         Define the behavior to evaluate the provided value.
         """
         return self()
 
+    def _batch(self) -> Callable[..., T]:
+        """
+        Get a callable producing one value for `map`, resolving anything shared by every value up front.
+
+        Evaluates the provider as usual by default, rejecting any kwargs if the evaluation does not accept them.
+        """
+        params = inspect.signature(self._evaluate).parameters.values()
+        if any(p.kind not in (p.POSITIONAL_ONLY, p.VAR_POSITIONAL) for p in params):
+            return self._evaluate
+
+        def evaluate(**kwargs) -> T:
+            if kwargs:
+                raise TypeError(f"{type(self).__name__} does not accept kwargs, cannot evaluate with {kwargs!r}.")
+            return self._evaluate()
+
+        return evaluate
+
+    def many(
+        self,
+        n: int,
+        *,
+        lazy: bool = False,
+        pool: concurrent.futures.Executor | None = None,
+        chunksize: int = 64,
+    ) -> list[T] | Iterator[T]:
+        """
+        Evaluate the provider `n` times, see `map`.
+        """
+        return self.map(itertools.repeat({}, n), lazy=lazy, pool=pool, chunksize=chunksize)
+
+    def map(
+        self,
+        kwargs: Iterable[dict[str, Any]],
+        *,
+        lazy: bool = False,
+        pool: concurrent.futures.Executor | None = None,
+        chunksize: int = 64,
+    ) -> list[T] | Iterator[T]:
+        """
+        Evaluate the provider once for each kwargs in `kwargs`, forwarding them to the evaluation.
+
+        Factories resolve their Provider arguments once, when `map` is called, and share them between every value.
+        Each value then costs a single call of `func` with the kwargs merged over those bound. Other providers are
+        evaluated as usual for each value. While any `tracing.Tracer` is registered each value is reported as a
+        `PROVIDER` event, unless constructed in a `pool`.
+
+        :param kwargs: for each value.
+        :param lazy: return an iterator producing values on demand rather than a list, so memory stays flat.
+        :param pool: to construct values in, e.g. a `ProcessPoolExecutor` for CPU heavy constructors. The factory
+            `func`, its resolved arguments and the kwargs must then be picklable.
+        :param chunksize: the number of values constructed per task submitted to the `pool`.
+        :return: the values, in order.
+        """
+        from scottzach1.pif import tracing
+        from scottzach1.pif.providers.util import construct
+
+        source = self
+        while (override := source._current_override()) is not None:
+            source = override
+        make = source._batch()
+        if tracing.hooks.tracers and pool is None:
+            batch = make
+
+            def make(**kw) -> T:
+                return tracing.trace(tracing.PROVIDER, source, batch, (), kw)
+
+        values = construct(make, kwargs, pool, chunksize)
+        return values if lazy else list(values)
+
+    def reset(self) -> None:
+        """
+        Discard any cached state, the next evaluation will construct a new value. Does nothing by default.
+        """
+
+    def _snapshot(self) -> object:
+        """
+        Capture any cached state for `Container.restore`.
+        """
+        return None
+
+    def _restore(self, state: object) -> None:
+        """
+        Restore the cached state captured by `_snapshot`.
+        """
+
     def override(self, provider: Provider[U] | None) -> Override[Provider[U] | None]:
         """
         Override the current providers value with another provider.
@@ -56,29 +257,161 @@ class Provider(abc.ABC, Generic[T]):
 
         return self.override(ExistingSingleton(value))
 
+    def local_override(self, provider: Provider[U] | None) -> LocalOverride[Provider[U] | None]:
+        """
+        Override the current providers value with another provider, only within the current thread or asyncio task.
+
+        Overriding with `None` disables any (local or global) override within the current context.
+        """
+        return LocalOverride(self, provider)
+
+    def local_override_existing(self, value: U) -> LocalOverride[Provider[U]]:
+        """
+        Override the current provider with an existing singleton, only within the current thread or asyncio task.
+        """
+        from scottzach1.pif.providers.existing_singleton import ExistingSingleton
+
+        return self.local_override(ExistingSingleton(value))
+
+    def _current_override(self) -> Provider | None:
+        """
+        Get the override that applies in the current context, if any.
+        """
+        if isinstance(override := self._override, _ContextOverride):
+            return override.current()
+        return override
+
+    def _set_global_override(self, provider: Provider | None) -> None:
+        with _local_lock:
+            self._global_override = provider
+            if not self._local_count:
+                self._override = provider
+                self._override_changed()
+        if provider is not None:
+            provider._add_dependent(self)  # So overriding the override also invalidates our dependents.
+        self._invalidate_dependents()
+
+    def _enter_local_override(self, provider: Provider | None) -> contextvars.Token:
+        with _local_lock:
+            if self._local_override is None:
+                self._local_override = contextvars.ContextVar(f"pif_override_{id(self)}")
+            if not self._local_count:
+                self._override = _ContextOverride(self)
+                self._override_changed()
+                for dependent in self._transitive_dependents():
+                    dependent._local_upstream |= {self}
+            self._local_count += 1
+        return self._local_override.set(provider)
+
+    def _exit_local_override(self, token: contextvars.Token) -> None:
+        self._local_override.reset(token)
+        with _local_lock:
+            self._local_count -= 1
+            if not self._local_count:
+                self._override = self._global_override
+                self._override_changed()
+                for dependent in self._transitive_dependents():
+                    dependent._local_upstream -= {self}
+
+
+class _Version:
+    """
+    A counter shared by every provider it watches, see `Provider._watch`.
+    """
+
+    __slots__ = ("value", "__weakref__")
+
+    def __init__(self):
+        self.value = 0
+
+
+class _ContextOverride:
+    """
+    Installed as the `_override` of a provider while it has active local overrides.
+
+    It is only truthy when an override applies in the current context, so `Provider.__call__` evaluates the base
+    provider directly otherwise.
+    """
+
+    __slots__ = ("_base",)
+
+    def __init__(self, base: Provider):
+        self._base = base
+
+    def current(self) -> Provider | None:
+        """
+        Get the override that applies in the current context.
+        """
+        # noinspection PyProtectedMember
+        if (override := self._base._local_override.get(_INHERIT)) is _INHERIT:
+            return self._base._global_override
+        return override
+
+    @property
+    def dependencies(self) -> tuple[Provider, ...]:
+        return (override,) if (override := self.current()) else ()
+
+    def __bool__(self) -> bool:
+        return bool(self.current())
+
+    def __call__(self, *args, **kwargs):
+        return self.current()(*args, **kwargs)
+
 
 class Override(Generic[T]):
     """
     A context manager to implement overrides for providers.
+
+    The override applies globally (to all threads and asyncio tasks) as soon as it is created.
     """
 
     __slots__ = ("_base", "_override", "_before")
 
     def __init__(self, base: Provider, override: Provider[T] | None = None):
         # noinspection PyProtectedMember
-        self._before = base._override
+        self._before = base._global_override
         self._base = base
         self._override = override
-        base._override = override
+        base._set_global_override(override)
 
     def __enter__(self) -> Override[T]:
-        yield self
+        return self
 
     def disable(self) -> None:
         """
         Disable the currently active override.
         """
-        self._base._override = self._before
+        # noinspection PyProtectedMember
+        self._base._set_global_override(self._before)
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.disable()
+
+
+class LocalOverride(Generic[T]):
+    """
+    A context manager to implement overrides for providers local to the current context.
+
+    The override only applies within the `with` block, to the current thread or asyncio task (and any tasks it
+    creates). Local overrides nest, and take precedence over global overrides. Providers never locally overridden are
+    evaluated exactly as fast as before.
+    """
+
+    __slots__ = ("_base", "_override", "_token")
+
+    def __init__(self, base: Provider, override: Provider[T] | None = None):
+        self._base = base
+        self._override = override
+        self._token: contextvars.Token | None = None
+
+    def __enter__(self) -> LocalOverride[T]:
+        if self._token is not None:
+            raise RuntimeError("LocalOverride is already active, create a new LocalOverride instead.")
+        # noinspection PyProtectedMember
+        self._token = self._base._enter_local_override(self._override)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # noinspection PyProtectedMember
+        self._base._exit_local_override(self._token)
+        self._token = None
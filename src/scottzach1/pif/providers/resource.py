@@ -0,0 +1,77 @@
+#                  _   _                 _     _
+#    ___  ___ ___ | |_| |_ ______ _  ___| |__ / |
+#   / __|/ __/ _ \| __| __|_  / _` |/ __| '_ \| |
+#   \__ \ (_| (_) | |_| |_ / / (_| | (__| | | | |
+#   |___/\___\___/ \__|\__/___\__,_|\___|_| |_|_|
+#
+#        Zac Scott (github.com/scottzach1)
+#
+#  https://github.com/scottzach1/python-injector-framework
+
+import contextlib
+import inspect
+import threading
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager
+from typing import TypeVar
+
+from scottzach1.pif.providers.provider import Provider
+from scottzach1.pif.providers.singleton import UNSET
+from scottzach1.pif.providers.util import bind, dependencies, generator_context
+
+__all__ = ("Resource",)
+
+T = TypeVar("T")
+
+
+class Resource(Provider[T]):
+    """
+    Provide a singleton instance with a teardown.
+
+    `func` may be a generator function yielding the value (the remainder of the generator is the teardown), or return
+    a context manager which is entered to get the value (and exited on teardown). Call `shutdown()` to teardown, the
+    next evaluation will set up the resource again.
+    """
+
+    __slots__ = ("_func", "_depends", "_result", "_stack", "_lock")
+
+    def __init__(self, func: Callable[..., Generator[T] | AbstractContextManager[T] | T], /, *args, **kwargs):
+        self._func = bind(func, args, kwargs)
+        self._set_dependencies(dependencies(*args, **kwargs))
+        self._result = UNSET
+        self._stack = contextlib.ExitStack()
+        self._lock = threading.RLock()
+
+    def _evaluate(self) -> T:
+        if (result := self._result) is not UNSET:
+            return result
+
+        with self._lock:
+            if (result := self._result) is UNSET:
+                result = self._func()
+                if inspect.isgenerator(result):
+                    result = self._stack.enter_context(generator_context(result))
+                elif isinstance(result, AbstractContextManager):
+                    result = self._stack.enter_context(result)
+                self._result = result
+        return result
+
+    def shutdown(self) -> None:
+        """
+        Teardown the resource (if it was set up).
+        """
+        with self._lock:
+            self._result = UNSET
+            self._stack.close()
+
+    def reset(self) -> None:
+        """
+        Teardown the resource, see `shutdown()`.
+        """
+        self.shutdown()
+
+    def _forked(self) -> None:
+        # Discard without a teardown, the resource is still owned by the parent process.
+        self._lock = threading.RLock()
+        self._result = UNSET
+        self._stack = contextlib.ExitStack()
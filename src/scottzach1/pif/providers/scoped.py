@@ -0,0 +1,172 @@
+#                  _   _                 _     _
+#    ___  ___ ___ | |_| |_ ______ _  ___| |__ / |
+#   / __|/ __/ _ \| __| __|_  / _` |/ __| '_ \| |
+#   \__ \ (_| (_) | |_| |_ / / (_| | (__| | | | |
+#   |___/\___\___/ \__|\__/___\__,_|\___|_| |_|_|
+#
+#        Zac Scott (github.com/scottzach1)
+#
+#  https://github.com/scottzach1/python-injector-framework
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import inspect
+import threading
+from collections.abc import AsyncGenerator, Awaitable, Callable, Generator
+from typing import Any, Generic, TypeVar
+
+from scottzach1.pif import exceptions
+from scottzach1.pif.providers.provider import Provider
+from scottzach1.pif.providers.util import async_generator_context, bind, dependencies, generator_context
+
+__all__ = ("Scope", "Scoped")
+
+T = TypeVar("T")
+TCallable = TypeVar("TCallable", bound=Callable)
+
+_active: contextvars.ContextVar[Scope | None] = contextvars.ContextVar("pif_scope", default=None)
+
+
+class Scope:
+    """
+    A lifetime for `Scoped` providers, e.g. a request or an asyncio task.
+
+    Use as a (sync or async) context manager, or as a decorator to run each call of a function in a fresh scope. Scopes
+    are tracked with `contextvars`, so they follow asyncio tasks and never leak between threads. On exit any generator
+    based instances are torn down in reverse order of creation, async generator based instances first (which requires
+    exiting with `async with`).
+    """
+
+    __slots__ = ("_instances", "_stack", "_async_stack", "_lock", "_token")
+
+    def __init__(self):
+        self._instances: dict[Scoped, object] = {}
+        self._stack = contextlib.ExitStack()
+        self._async_stack: contextlib.AsyncExitStack | None = None
+        self._lock = threading.RLock()
+        self._token: contextvars.Token | None = None
+
+    @staticmethod
+    def current() -> Scope | None:
+        """
+        Get the innermost active scope, if any.
+        """
+        return _active.get()
+
+    def get(self, provider: Scoped[T]) -> T:
+        """
+        Get the instance of `provider` for this scope, building it on first use.
+        """
+        try:
+            return self._instances[provider]
+        except KeyError:
+            pass
+
+        with self._lock:
+            if provider not in self._instances:
+                # noinspection PyProtectedMember
+                result = provider._func()
+                if inspect.isgenerator(result):
+                    result = self._stack.enter_context(generator_context(result))
+                elif inspect.isasyncgen(result):
+                    result = self._enter_async(result)
+                self._instances[provider] = result
+            return self._instances[provider]
+
+    def _enter_async(self, agen: AsyncGenerator[T]) -> _AsyncInstance[T]:
+        import asyncio  # Only imported once needed, as it is slow to import.
+
+        if self._async_stack is None:
+            self._async_stack = contextlib.AsyncExitStack()
+        enter = self._async_stack.enter_async_context(async_generator_context(agen))
+        return _AsyncInstance(asyncio.get_running_loop().create_task(enter))
+
+    def __enter__(self) -> Scope:
+        if self._token is not None:
+            raise RuntimeError("Scope is already active, create a new Scope instead.")
+        self._token = _active.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _active.reset(self._token)
+        self._token = None
+        try:
+            suppress = self._stack.__exit__(exc_type, exc_val, exc_tb)
+        finally:
+            self._instances.clear()
+        if self._async_stack is not None:
+            self._async_stack = None
+            raise RuntimeError("Scope has async generator instances to teardown, exit it with `async with` instead.")
+        return suppress
+
+    async def __aenter__(self) -> Scope:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        stack = contextlib.AsyncExitStack()
+        stack.push(self.__exit__)
+        if self._async_stack is not None:
+            stack.push_async_exit(self._async_stack)
+            self._async_stack = None
+        return await stack.__aexit__(exc_type, exc_val, exc_tb)
+
+    def __call__(self, func: TCallable) -> TCallable:
+        """
+        Decorate `func` so every call runs within a new scope.
+        """
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                async with Scope():
+                    return await func(*args, **kwargs)
+
+        else:
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with Scope():
+                    return func(*args, **kwargs)
+
+        return wrapper
+
+
+class _AsyncInstance(Generic[T]):
+    """
+    The instance of an async generator based `Scoped` provider, each await provides the value once set up.
+    """
+
+    __slots__ = ("_task",)
+
+    def __init__(self, task: Awaitable[T]):
+        self._task = task
+
+    def __await__(self) -> Generator[Any, None, T]:
+        import asyncio
+
+        # Shield the shared set up so cancelling one awaiter does not cancel it for the others.
+        return asyncio.shield(self._task).__await__()
+
+
+class Scoped(Provider[T]):
+    """
+    Provide one instance per active `Scope`.
+
+    If `func` is a generator function the yielded value is provided, and the remainder of the generator is run as
+    teardown when the scope exits. If `func` is an async generator function an awaitable of the yielded value is
+    provided instead, and the remainder is run when the scope exits with `async with`.
+    """
+
+    __slots__ = ("_func", "_depends")
+
+    def __init__(self, func: Callable[..., T], /, *args, **kwargs):
+        self._func = bind(func, args, kwargs)
+        self._set_dependencies(dependencies(*args, **kwargs))
+
+    def _evaluate(self) -> T:
+        if (scope := _active.get()) is None:
+            raise exceptions.NoActiveScopeException()
+        return scope.get(self)
@@ -8,33 +8,174 @@
 #
 #  https://github.com/scottzach1/python-injector-framework
 
+import enum
 import functools
+import os
+import threading
+import weakref
 from collections.abc import Callable
 from typing import TypeVar
 
 from scottzach1.pif.providers.provider import Provider
-from scottzach1.pif.providers.util import intercept_args
+from scottzach1.pif.providers.util import bind, check_reserved, dependencies, executor, parallel_intercept_args
 
-__all__ = ("Singleton",)
+__all__ = ("Singleton", "ThreadMode", "Invalidation")
 
 T = TypeVar("T")
 UNSET = object()
 
 
+class ThreadMode(enum.StrEnum):
+    """
+    How a `Singleton` guards its first evaluation across threads.
+    """
+
+    LOCK = "lock"
+    """Double-checked locking, exactly one instance is ever constructed."""
+    NO_LOCK = "no-lock"
+    """No synchronisation, racing threads may each construct (and all but one discard) an instance."""
+    PER_THREAD = "per-thread"
+    """One instance per thread."""
+
+
+class Invalidation(enum.StrEnum):
+    """
+    What a `Singleton` does when any of its (transitive) dependencies are globally overridden.
+    """
+
+    LAZY = "lazy"
+    """Discard the instance, the next evaluation will construct a new one."""
+    EAGER = "eager"
+    """Discard the instance and construct a new one in the background on the shared thread pool."""
+    NEVER = "never"
+    """Keep the instance."""
+
+
+_RESERVED = ("singleton_thread_mode", "singleton_parallel", "singleton_invalidate", "singleton_fork_safe")
+"""The keywords reserved by `Singleton`, never forwarded to `func`."""
+
+
 class Singleton(Provider[T]):
     """
     Provide a singleton instance.
 
-    Note that overriding any provider arguments will not cause the singleton to reevaluate.
+    The first evaluation is guarded according to `singleton_thread_mode`, once an instance exists it is returned without
+    taking any locks. When `singleton_parallel` is set, any Provider arguments are evaluated concurrently on a shared
+    thread pool.
+
+    Globally overriding any (transitive) provider argument invalidates the instance according to
+    `singleton_invalidate`. Local overrides never invalidate the instance, instead while any (transitive) provider
+    argument is locally overridden in the current context a new instance is constructed on every evaluation and never
+    cached, so it cannot leak into other contexts.
+
+    When the process forks, children inherit the instance unless the singleton is not `singleton_fork_safe` (e.g. it
+    holds a socket, lock or thread pool), in which case the child discards it along with the instance of any singleton
+    (transitively) depending on it. Children always get fresh locks.
+
+    The `singleton_thread_mode`, `singleton_parallel`, `singleton_invalidate` and `singleton_fork_safe` keywords are
+    reserved and never forwarded to `func`, which must not take them.
     """
 
-    __slots__ = ("_func", "_func", "_result", "_depends")
+    __slots__ = ("_func", "_result", "_depends", "_thread_mode", "_invalidate", "_fork_safe", "_lock", "_local")
 
-    def __init__(self, func: Callable[..., T], *args, **kwargs):
-        self._func = functools.partial(intercept_args(func), *args, **kwargs)
+    def __init__(
+        self,
+        func: Callable[..., T],
+        /,
+        *args,
+        singleton_thread_mode: ThreadMode | str = ThreadMode.LOCK,
+        singleton_parallel: bool = False,
+        singleton_invalidate: Invalidation | str = Invalidation.LAZY,
+        singleton_fork_safe: bool = True,
+        **kwargs,
+    ):
+        check_reserved(Singleton, func, *_RESERVED)
+        if singleton_parallel:
+            self._func = functools.partial(parallel_intercept_args(func), *args, **kwargs)
+        else:
+            self._func = bind(func, args, kwargs)
+        self._set_dependencies(dependencies(*args, **kwargs))
         self._result = UNSET
+        self._thread_mode = ThreadMode(singleton_thread_mode)
+        self._invalidate = Invalidation(singleton_invalidate)
+        self._fork_safe = singleton_fork_safe
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        _instances.add(self)
 
     def _evaluate(self) -> T:
-        if self._result is UNSET:
-            self._result = self._func()
+        if (result := self._result) is not UNSET and not self._local_upstream:
+            return result
+
+        if self._local_upstream and self._locally_overridden():
+            return self._func()
+        if result is not UNSET:
+            return result
+
+        if self._thread_mode is ThreadMode.PER_THREAD:
+            if (result := getattr(self._local, "result", UNSET)) is UNSET:
+                result = self._local.result = self._func()
+            return result
+
+        if self._thread_mode is ThreadMode.NO_LOCK:
+            self._result = result = self._func()
+            return result
+
+        with self._lock:
+            if (result := self._result) is UNSET:
+                self._result = result = self._func()
+        return result
+
+    def reset(self) -> None:
+        """
+        Discard the instance (for all threads), the next evaluation will construct a new one.
+        """
+        with self._lock:
+            self._result = UNSET
+            self._local = threading.local()
+
+    def _upstream_overridden(self) -> None:
+        if self._invalidate is Invalidation.NEVER:
+            return
+        self.reset()
+        if self._invalidate is Invalidation.EAGER:
+            executor().submit(self)
+
+    def _forked(self) -> None:
+        self._result = UNSET
+        self._local = threading.local()
+
+    def _snapshot(self) -> object:
         return self._result
+
+    def _restore(self, state: object) -> None:
+        with self._lock:
+            self._result = state
+
+
+_instances: weakref.WeakSet[Singleton] = weakref.WeakSet()
+
+
+def _after_fork_in_child() -> None:
+    """
+    Give every singleton a fresh lock, and discard the instances of fork unsafe singletons and anything cached by their
+    dependents.
+    """
+    singletons = list(_instances)
+    for singleton in singletons:
+        singleton._lock = threading.RLock()
+
+    # noinspection PyProtectedMember
+    stack: list[Provider] = [s for s in singletons if not s._fork_safe]
+    seen: set[Provider] = set(stack)
+    while stack:
+        provider = stack.pop()
+        provider._forked()
+        for dependent in list(provider._dependents or ()):
+            if dependent not in seen:
+                seen.add(dependent)
+                stack.append(dependent)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -1,7 +1,104 @@
+import collections
+import concurrent.futures
+import contextlib
+import contextvars
 import functools
+import inspect
+import itertools
+import os
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, TypeVar
 
 from scottzach1.pif.providers.provider import Provider
 
+T = TypeVar("T")
+
+
+generator_context = contextlib.contextmanager(lambda gen: gen)
+"""
+Wrap a (single yield) generator object as a context manager, e.g. `stack.enter_context(generator_context(gen))`.
+"""
+
+async_generator_context = contextlib.asynccontextmanager(lambda agen: agen)
+"""
+Wrap a (single yield) async generator object as an async context manager, see `generator_context`.
+"""
+
+
+def dependencies(*args, **kwargs) -> tuple[Provider, ...]:
+    """
+    Get the Provider values from the args and kwargs a provider was constructed with.
+
+    :raises TypeError: if any value is a `Pool`, as nothing would ever return its instances to the pool.
+    """
+    from scottzach1.pif.providers.pool import Pool
+
+    depends = tuple(v for v in (*args, *kwargs.values()) if isinstance(v, Provider))
+    if any(isinstance(v, Pool) for v in depends):
+        raise TypeError("A Pool cannot be a provider argument, inject it into a function or use Pool.checkout().")
+    return depends
+
+
+def check_reserved(provider: type, func: Callable, *names: str) -> None:
+    """
+    Refuse a `func` taking any keyword reserved by a provider, as the keyword would never be forwarded to it.
+
+    :param provider: type reserving the keywords, for the error message.
+    :param func: to check.
+    :param names: of the reserved keywords.
+    :raises TypeError: if `func` takes any of the keywords.
+    """
+    try:
+        params = inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return  # No signature, e.g. some builtins.
+
+    keyword = (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+    if clashes := [name for name in names if name in params and params[name].kind in keyword]:
+        raise TypeError(
+            f"{provider.__name__} reserves the {', '.join(map(repr, clashes))} keyword(s), which {func!r} also takes. "
+            "Bind them with functools.partial first, or wrap func."
+        )
+
+
+def bind(func: Callable[..., T], args: tuple, kwargs: dict[str, Any]) -> Callable[..., T]:
+    """
+    Bind args and kwargs to `func`, evaluating any Provider values on each call.
+
+    The arguments are classified once here into static values and Provider slots. Without any Provider values this is
+    a plain `functools.partial` (or `func` itself), otherwise only the Provider slots are substituted on each call.
+    Like `functools.partial`, args supplied when calling are appended and kwargs are merged.
+
+    :param func: to bind.
+    :param args: to bind, may contain Provider values.
+    :param kwargs: to bind, may contain Provider values.
+    :return: the bound callable.
+    """
+    arg_slots = tuple(i for i, a in enumerate(args) if isinstance(a, Provider))
+    kwarg_slots = tuple(k for k, v in kwargs.items() if isinstance(v, Provider))
+
+    if not arg_slots and not kwarg_slots:
+        return functools.partial(func, *args, **kwargs) if args or kwargs else func
+
+    def bound(*extra, **extra_kwargs):
+        resolved = list(args)
+        for i in arg_slots:
+            resolved[i] = args[i]()
+
+        resolved_kwargs = kwargs
+        if kwarg_slots:
+            resolved_kwargs = kwargs.copy()
+            for k in kwarg_slots:
+                resolved_kwargs[k] = kwargs[k]()
+        if extra_kwargs:
+            resolved_kwargs = {**resolved_kwargs, **extra_kwargs}
+
+        return func(*resolved, *extra, **resolved_kwargs)
+
+    bound.__wrapped__ = func
+    return bound
+
 
 def intercept_args(func):
     """
@@ -18,3 +115,156 @@ def intercept_args(func):
         )
 
     return wrapper
+
+
+_executor: concurrent.futures.ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_worker = threading.local()
+
+
+def _mark_worker() -> None:
+    _worker.active = True
+
+
+def _reset_executor() -> None:
+    """
+    Forget the thread pool inherited from a parent process, its threads do not exist in the child.
+    """
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_executor)
+
+
+def executor() -> concurrent.futures.ThreadPoolExecutor:
+    """
+    Get the thread pool shared by all providers resolving their arguments in parallel.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = concurrent.futures.ThreadPoolExecutor(thread_name_prefix="pif", initializer=_mark_worker)
+    return _executor
+
+
+def parallel_intercept_args(func):
+    """
+    Intercepts the args and kwargs at runtime evaluating any Provider values in parallel on the shared thread pool.
+
+    The first Provider is evaluated on the calling thread. Every Provider is always allowed to finish, if any raised
+    then the exception of the first failing argument (in argument order) is propagated. Evaluations already running on
+    a pool worker are resolved sequentially, so nested graphs cannot exhaust the pool and deadlock.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        values = [*args, *kwargs.values()]
+        indexes = [i for i, v in enumerate(values) if isinstance(v, Provider)]
+
+        if len(indexes) < 2 or getattr(_worker, "active", False):
+            for i in indexes:
+                values[i] = values[i]()
+        else:
+            pool = executor()
+            futures = [pool.submit(contextvars.copy_context().run, values[i]) for i in indexes[1:]]
+            try:
+                first = values[indexes[0]]()
+            except BaseException:
+                concurrent.futures.wait(futures)
+                raise
+            concurrent.futures.wait(futures)
+            values[indexes[0]] = first
+            for i, future in zip(indexes[1:], futures, strict=True):
+                values[i] = future.result()
+
+        return func(*values[: len(args)], **dict(zip(kwargs, values[len(args) :], strict=True)))
+
+    return wrapper
+
+
+def _construct(make: Callable[..., T], chunk: list[dict[str, Any]]) -> list[T]:
+    return [make(**kwargs) for kwargs in chunk]
+
+
+def _construct_in(
+    make: Callable[..., T],
+    kwargs: Iterator[dict[str, Any]],
+    pool: concurrent.futures.Executor,
+    chunksize: int,
+) -> Iterator[T]:
+    pending: collections.deque[concurrent.futures.Future] = collections.deque()
+    try:
+        while chunk := list(itertools.islice(kwargs, chunksize)):
+            pending.append(pool.submit(_construct, make, chunk))
+            if len(pending) > 2 * (os.cpu_count() or 1):
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def construct(
+    make: Callable[..., T],
+    kwargs: Iterable[dict[str, Any]],
+    pool: concurrent.futures.Executor | None = None,
+    chunksize: int = 64,
+) -> Iterator[T]:
+    """
+    Lazily call `make(**kw)` for each `kw` in `kwargs`.
+
+    With a `pool` the calls are submitted in chunks of `chunksize`, keeping a bounded number of chunks in flight so
+    memory stays flat however many values are consumed. Values are always produced in order.
+
+    :param make: to call.
+    :param kwargs: for each call.
+    :param pool: to call `make` in, e.g. a `ProcessPoolExecutor` (then `make` and `kwargs` must be picklable).
+    :param chunksize: the number of calls per task submitted to the `pool`.
+    :return: an iterator of the results.
+    """
+    if pool is None:
+        return (make(**kw) for kw in kwargs)
+    return _construct_in(make, iter(kwargs), pool, chunksize)
+
+
+async def await_all(values: list[Any]) -> list[Any]:
+    """
+    Concurrently await any awaitable values with `asyncio.gather`, substituting their results in place.
+
+    :param values: to resolve.
+    :return: the same list, with no remaining awaitable values.
+    """
+    import asyncio  # Only imported once needed, as it is slow to import.
+
+    if indexes := [i for i, v in enumerate(values) if inspect.isawaitable(v)]:
+        for i, result in zip(indexes, await asyncio.gather(*(values[i] for i in indexes)), strict=True):
+            values[i] = result
+    return values
+
+
+def async_intercept_args(func):
+    """
+    Intercepts the args and kwargs at runtime concurrently awaiting any Provider values.
+
+    The wrapped `func` may either be a coroutine function or a regular callable.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        values = await await_all(
+            [
+                *(a() if isinstance(a, Provider) else a for a in args),
+                *(v() if isinstance(v, Provider) else v for v in kwargs.values()),
+            ]
+        )
+        result = func(*values[: len(args)], **dict(zip(kwargs, values[len(args) :], strict=True)))
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    return wrapper
@@ -0,0 +1,247 @@
+#                  _   _                 _     _
+#    ___  ___ ___ | |_| |_ ______ _  ___| |__ / |
+#   / __|/ __/ _ \| __| __|_  / _` |/ __| '_ \| |
+#   \__ \ (_| (_) | |_| |_ / / (_| | (__| | | | |
+#   |___/\___\___/ \__|\__/___\__,_|\___|_| |_|_|
+#
+#        Zac Scott (github.com/scottzach1)
+#
+#  https://github.com/scottzach1/python-injector-framework
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import dataclasses
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from typing import Any
+
+from scottzach1.pif.providers.provider import Provider
+
+__all__ = (
+    "PROVIDER",
+    "INJECT",
+    "Tracer",
+    "Span",
+    "ResolutionTracer",
+    "add_tracer",
+    "remove_tracer",
+    "traced",
+    "describe",
+)
+
+PROVIDER = "provider"
+"""The kind of event for the evaluation of a provider, the target is the provider."""
+INJECT = "inject"
+"""The kind of event for a call to an injected function, the target is the undecorated function."""
+
+
+class Tracer:
+    """
+    Receives an event around each provider evaluation and each call to an injected function while registered.
+
+    `enter` is called before, and `exit` after, with whatever state `enter` returned. Events nest, a provider evaluated
+    while injecting a function is entered (and exited) within the function's event.
+    """
+
+    __slots__ = ()
+
+    def enter(self, kind: str, target: Any) -> Any:
+        """
+        Called before an event, the returned value is passed to `exit`.
+        """
+
+    def exit(self, kind: str, target: Any, state: Any, elapsed_ns: int, error: BaseException | None) -> None:
+        """
+        Called after an event, with the time it took and any exception raised.
+        """
+
+
+class _Hooks:
+    """
+    The registered tracers, read by `Provider.__call__` (while patched) and injected functions on every call.
+    """
+
+    __slots__ = ("tracers",)
+
+    def __init__(self):
+        self.tracers: tuple[Tracer, ...] = ()
+
+
+hooks = _Hooks()
+_lock = threading.Lock()
+_original_call = Provider.__call__
+
+
+def trace(kind: str, target: Any, func: Callable, args: tuple, kwargs: dict) -> Any:
+    """
+    Call `func` within an event notifying all registered tracers.
+    """
+    tracers = hooks.tracers
+    states = [tracer.enter(kind, target) for tracer in tracers]
+    error = None
+    start = time.perf_counter_ns()
+    try:
+        return func(*args, **kwargs)
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        elapsed = time.perf_counter_ns() - start
+        for tracer, state in zip(reversed(tracers), reversed(states), strict=True):
+            tracer.exit(kind, target, state, elapsed, error)
+
+
+async def trace_async(kind: str, target: Any, func: Callable[..., Awaitable], args: tuple, kwargs: dict) -> Any:
+    """
+    Await `func` within an event notifying all registered tracers.
+    """
+    tracers = hooks.tracers
+    states = [tracer.enter(kind, target) for tracer in tracers]
+    error = None
+    start = time.perf_counter_ns()
+    try:
+        return await func(*args, **kwargs)
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        elapsed = time.perf_counter_ns() - start
+        for tracer, state in zip(reversed(tracers), reversed(states), strict=True):
+            tracer.exit(kind, target, state, elapsed, error)
+
+
+def _traced_call(self: Provider, *args, **kwargs):
+    return trace(PROVIDER, self, _original_call, (self, *args), kwargs)
+
+
+def add_tracer(tracer: Tracer) -> None:
+    """
+    Register a tracer. While no tracers are registered `Provider.__call__` is left untouched.
+    """
+    with _lock:
+        if tracer not in hooks.tracers:
+            hooks.tracers = (*hooks.tracers, tracer)
+        Provider.__call__ = _traced_call
+
+
+def remove_tracer(tracer: Tracer) -> None:
+    """
+    Unregister a tracer (if registered).
+    """
+    with _lock:
+        hooks.tracers = tuple(t for t in hooks.tracers if t is not tracer)
+        if not hooks.tracers:
+            Provider.__call__ = _original_call
+
+
+@contextlib.contextmanager
+def traced(tracer: Tracer) -> Iterator[Tracer]:
+    """
+    Register a tracer for the duration of the context.
+    """
+    add_tracer(tracer)
+    try:
+        yield tracer
+    finally:
+        remove_tracer(tracer)
+
+
+def describe(target: Any) -> str:
+    """
+    Get a human readable label for a provider or function, e.g. `Singleton(ApiClient)` or `main`.
+    """
+    if not isinstance(target, Provider):
+        return getattr(target, "__qualname__", None) or repr(target)
+
+    func = getattr(target, "_func", None)
+    func = getattr(func, "func", func)  # functools.partial
+    func = getattr(func, "__wrapped__", func)  # intercept_args
+    if func is None:
+        return f"{type(target).__name__}()"
+    return f"{type(target).__name__}({getattr(func, '__qualname__', None) or type(func).__name__})"
+
+
+@dataclasses.dataclass(eq=False)
+class Span:
+    """
+    A single traced event and the events nested within it.
+    """
+
+    kind: str
+    name: str
+    duration_ns: int = 0
+    error: bool = False
+    children: list[Span] = dataclasses.field(default_factory=list)
+
+    @property
+    def self_ns(self) -> int:
+        """
+        Time spent in this event excluding nested events.
+        """
+        return max(self.duration_ns - sum(child.duration_ns for child in self.children), 0)
+
+    def walk(self, stack: tuple[str, ...] = ()) -> Iterator[tuple[tuple[str, ...], Span]]:
+        """
+        Yield each span in the tree along with the names of its ancestors (inclusive).
+        """
+        stack = (*stack, self.name)
+        yield stack, self
+        for child in self.children:
+            yield from child.walk(stack)
+
+
+class ResolutionTracer(Tracer):
+    """
+    Records a tree of spans with timings per thread/asyncio task.
+
+    Use `collapsed()` to export the recorded trees in the collapsed stack format understood by flame graph tools such
+    as `flamegraph.pl` and speedscope.
+    """
+
+    __slots__ = ("roots", "_current", "_lock")
+
+    def __init__(self):
+        self.roots: list[Span] = []
+        self._current: contextvars.ContextVar[Span | None] = contextvars.ContextVar(f"pif_span_{id(self)}")
+        self._lock = threading.Lock()
+
+    def enter(self, kind: str, target: Any) -> Any:
+        span = Span(kind=kind, name=describe(target))
+        if (parent := self._current.get(None)) is not None:
+            parent.children.append(span)
+        else:
+            with self._lock:
+                self.roots.append(span)
+        return span, self._current.set(span)
+
+    def exit(self, kind: str, target: Any, state: Any, elapsed_ns: int, error: BaseException | None) -> None:
+        span, token = state
+        span.duration_ns = elapsed_ns
+        span.error = error is not None
+        self._current.reset(token)
+
+    def collapsed(self, unit_ns: int = 1_000) -> str:
+        """
+        Export the recorded trees as collapsed stacks, one `frame;frame;frame value` line per unique stack.
+
+        :param unit_ns: nanoseconds per unit of the reported (self time) values, defaults to microseconds.
+        :return: the collapsed stacks.
+        """
+        totals: dict[str, int] = {}
+        with self._lock:
+            roots = list(self.roots)
+        for root in roots:
+            for stack, span in root.walk():
+                key = ";".join(name.replace(";", ":") for name in stack)
+                totals[key] = totals.get(key, 0) + span.self_ns
+        return "\n".join(f"{key} {value // unit_ns}" for key, value in totals.items())
+
+    def clear(self) -> None:
+        """
+        Discard all recorded spans.
+        """
+        with self._lock:
+            self.roots.clear()
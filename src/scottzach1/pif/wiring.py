@@ -8,17 +8,46 @@
 #
 #  https://github.com/scottzach1/python-injector-framework
 
+from __future__ import annotations
+
+import contextlib
+import contextvars
 import functools
 import importlib
+import importlib.abc
+import importlib.machinery
 import inspect
 import itertools
+import os
+import sys
 import types
-from collections.abc import Callable
-from typing import Any, TypeVar
-
+import weakref
+from collections.abc import Callable, Iterator
+from typing import TYPE_CHECKING, Any, Generic, NamedTuple, TypeVar
+
+from scottzach1.pif import tracing
+from scottzach1.pif.cache import Target, WiringCache
+from scottzach1.pif.providers.existing_singleton import ExistingSingleton
+from scottzach1.pif.providers.pool import Pool
 from scottzach1.pif.providers.provider import Provider
-
-__all__ = ("intercept", "patch_args", "inject", "is_patched", "patch_method", "unpatch_method", "wire", "unwire")
+from scottzach1.pif.providers.singleton import UNSET, Singleton
+from scottzach1.pif.providers.util import await_all, executor
+
+if TYPE_CHECKING:
+    from scottzach1.pif.analysis import Index
+
+__all__ = (
+    "intercept",
+    "patch_args",
+    "inject",
+    "Inject",
+    "is_patched",
+    "patch_method",
+    "unpatch_method",
+    "Wiring",
+    "wire",
+    "unwire",
+)
 
 
 def intercept(func):
@@ -65,34 +94,324 @@ def patch_args(
     return args, kwargs
 
 
+T = TypeVar("T")
 TCallable = TypeVar("TCallable", bound=Callable)
 
 
+async def _await_injected(
+    args: tuple[Any, ...],
+    n: int,
+    kwargs: dict[str, Any],
+    names: list[str],
+) -> tuple[tuple[Any, ...], dict[str, Any]]:
+    """
+    Concurrently await any awaitable values injected after the first `n` args or into the `names` kwargs.
+    """
+    values = await await_all([*args[n:], *(kwargs[name] for name in names)])
+    kwargs.update(zip(names, values[len(args) - n :], strict=True))
+    return (*args[:n], *values[: len(args) - n]), kwargs
+
+
+class _Param(NamedTuple):
+    """
+    The parts of a parameter that determine the generated injector.
+    """
+
+    name: str
+    kind: inspect._ParameterKind
+    has_default: bool
+    provider: bool
+    pool: bool
+
+
+class _Analysis(NamedTuple):
+    """
+    A function with Provider defaults, as needed to generate its injector.
+    """
+
+    params: tuple[_Param, ...]
+    defaults: dict[str, Any]
+    """The default of each parameter with one, keyed by the name referencing it from the generated code."""
+
+    @classmethod
+    def of(cls, signature: inspect.Signature) -> _Analysis:
+        params, defaults = [], {}
+        for i, p in enumerate(signature.parameters.values()):
+            params.append(
+                _Param(
+                    p.name,
+                    p.kind,
+                    p.default is not inspect.Parameter.empty,
+                    isinstance(p.default, Provider),
+                    isinstance(p.default, Pool),
+                )
+            )
+            if p.default is not inspect.Parameter.empty:
+                defaults[f"_v{i}"] = p.default
+        return cls(tuple(params), defaults)
+
+
+_analysis: weakref.WeakKeyDictionary[Callable, tuple[Any, Any, _Analysis | None]] = weakref.WeakKeyDictionary()
+"""Each analysed function mapped to its `__defaults__`, `__kwdefaults__` and analysis (if it has Provider defaults)."""
+
+
+def _signature_from_code(func: types.FunctionType) -> inspect.Signature:
+    """
+    Build the signature of a plain Python function directly from its code object and defaults.
+
+    Annotations are not needed to generate an injector, so they are omitted.
+    """
+    code, param = func.__code__, inspect.Parameter
+    names = code.co_varnames
+    n_args, n_kwonly = code.co_argcount, code.co_kwonlyargcount
+    defaults = func.__defaults__ or ()
+    kwdefaults = func.__kwdefaults__ or {}
+    first_default = n_args - len(defaults)
+
+    params = [
+        param(
+            name,
+            param.POSITIONAL_ONLY if i < code.co_posonlyargcount else param.POSITIONAL_OR_KEYWORD,
+            default=defaults[i - first_default] if i >= first_default else param.empty,
+        )
+        for i, name in enumerate(names[:n_args])
+    ]
+    index = n_args + n_kwonly
+    if code.co_flags & inspect.CO_VARARGS:
+        params.append(param(names[index], param.VAR_POSITIONAL))
+        index += 1
+    params += [
+        param(name, param.KEYWORD_ONLY, default=kwdefaults.get(name, param.empty))
+        for name in names[n_args : n_args + n_kwonly]
+    ]
+    if code.co_flags & inspect.CO_VARKEYWORDS:
+        params.append(param(names[index], param.VAR_KEYWORD))
+    return inspect.Signature(params, __validate_parameters__=False)
+
+
+def _analyse(func: Callable) -> _Analysis | None:
+    """
+    Analyse the signature of `func` if it has any Provider defaults, otherwise None.
+
+    Plain Python functions are analysed from their `__defaults__`, `__kwdefaults__` and code object, so functions
+    without any Provider defaults never build a signature. Any other callable (including wrappers setting
+    `__wrapped__` or `__signature__`) falls back to `inspect.signature`. Results are cached per function until its
+    defaults are reassigned.
+
+    :param func: to analyse.
+    :return: the analysis, or None if there is nothing to inject (or no signature can be derived).
+    """
+    defaults, kwdefaults = getattr(func, "__defaults__", None), getattr(func, "__kwdefaults__", None)
+    try:
+        cached = _analysis.get(func)
+    except TypeError:
+        cached = None  # Not weak referenceable.
+    if cached is not None and cached[0] is defaults and cached[1] is kwdefaults:
+        return cached[2]
+
+    if type(func) is types.FunctionType and not {"__wrapped__", "__signature__"} & func.__dict__.keys():
+        if any(isinstance(v, Provider) for v in (*(defaults or ()), *(kwdefaults or {}).values())):
+            signature = _signature_from_code(func)
+        else:
+            signature = None
+    else:
+        try:
+            signature = inspect.signature(func)
+        except (ValueError, TypeError):
+            signature = None  # We cannot derive signature from provided callable.
+        if signature and not any(isinstance(p.default, Provider) for p in signature.parameters.values()):
+            signature = None
+
+    analysis = _Analysis.of(signature) if signature else None
+    with contextlib.suppress(TypeError):
+        _analysis[func] = (defaults, kwdefaults, analysis)
+    return analysis
+
+
+@functools.lru_cache(maxsize=1024)
+def _injector_code(params: tuple[_Param, ...], is_async: bool) -> types.CodeType | None:
+    """
+    Generate the code of a wrapper specialised to the `Provider` defaults of `params`.
+
+    The signature is only walked once here, the generated wrapper executes a fixed plan of `len(args)` comparisons and
+    dict writes. Positional only tails are unrolled for each possible number of supplied positional arguments. The
+    code only depends on the shape of the signature, so it is shared by every function of the same shape.
+
+    Coroutine functions get an `async` wrapper which concurrently awaits any awaitable injected values (e.g. from an
+    `AsyncFactory`) before awaiting `func`. Instances injected from a `Pool` are released once `func` returns. While any
+    `tracing.Tracer` is registered each call is reported as an `INJECT` event.
+
+    :param params: of the function to wrap.
+    :param is_async: whether the function is a coroutine function.
+    :return: the code defining `wrapper`, or None if there is nothing to inject.
+    """
+    lines: list[str] = []
+    pools = [i for i, p in enumerate(params) if p.pool]
+
+    def evaluate(i: int) -> str:
+        return f"(_r{i} := _v{i}())" if i in pools else f"_v{i}()"
+
+    positional_only = [p for p in params if p.kind == inspect.Parameter.POSITIONAL_ONLY]
+    provided = [i for i, p in enumerate(positional_only) if p.provider]
+    if provided:
+        last = provided[-1]
+        first = next(i for i, p in enumerate(positional_only) if p.has_default)
+        for n in range(first, last + 1):
+            fills = [evaluate(i) if i in provided else f"_v{i}" for i in range(n, last + 1)]
+            lines.append(f"{'if' if n == first else 'elif'} n == {n}:")
+            lines.append(f"    args = (*args, {', '.join(fills)})")
+
+    for i, param in enumerate(params):
+        if not param.provider or param.kind == inspect.Parameter.POSITIONAL_ONLY:
+            continue
+        if param.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD:
+            lines.append(f"if n <= {i} and {param.name!r} not in kwargs:")
+        else:
+            lines.append(f"if {param.name!r} not in kwargs:")
+        lines.append(f"    kwargs[{param.name!r}] = {evaluate(i)}")
+        if is_async:
+            lines.append(f"    injected.append({param.name!r})")
+
+    if not lines:
+        return None
+
+    if is_async:
+        header = ["n = len(args)", "injected = []"]
+        lines += [
+            "if injected or len(args) > n:",
+            "    args, kwargs = await _await_injected(args, n, kwargs, injected)",
+            "return await func(*args, **kwargs)",
+        ]
+    else:
+        header = ["n = len(args)"]
+        lines.append("return func(*args, **kwargs)")
+
+    if pools:
+        header += [f"_r{i} = _UNSET" for i in pools]
+        lines = ["try:", *(f"    {line}" for line in lines), "finally:"]
+        for i in pools:
+            lines += [f"    if _r{i} is not _UNSET:", f"        _v{i}.release(_r{i})"]
+
+    # The traced variant delegates to the untraced body so tracers see a single event per call.
+    body = [f"    {line}" for line in (*header, *lines)]
+    prefix, trace = ("async def", "await _trace_async") if is_async else ("def", "_trace")
+    source = "\n".join(
+        (
+            f"{prefix} _untraced(*args, **kwargs):",
+            *body,
+            f"{prefix} wrapper(*args, **kwargs):",
+            "    if _hooks.tracers:",
+            f"        return {trace}(_INJECT, func, _untraced, args, kwargs)",
+            *body,
+        )
+    )
+    return compile(source, "<pif-inject>", "exec")
+
+
+def _compile_injector(func: Callable, analysis: _Analysis) -> Callable | None:
+    """
+    Generate a wrapper specialised to the `Provider` defaults of `func`, see `_injector_code`.
+
+    :param func: to wrap.
+    :param analysis: of `func`.
+    :return: the generated wrapper, or None if there is nothing to inject.
+    """
+    if (code := _injector_code(analysis.params, inspect.iscoroutinefunction(func))) is None:
+        return None
+
+    namespace: dict[str, Any] = {
+        "func": func,
+        "_await_injected": _await_injected,
+        "_UNSET": UNSET,
+        "_hooks": tracing.hooks,
+        "_trace": tracing.trace,
+        "_trace_async": tracing.trace_async,
+        "_INJECT": tracing.INJECT,
+        **analysis.defaults,
+    }
+    exec(code, namespace)
+    return namespace["wrapper"]
+
+
 def inject(func: TCallable) -> TCallable:
     """
     Get a decorated copy of `func` with patched arguments.
 
+    The signature is analysed once at decoration time to generate a specialised wrapper, so each call only evaluates
+    the `Provider` defaults that were not supplied by the caller.
+
+    Decorating a class patches its `__init__` in place.
+
     :param func: to decorate.
     :return: the decorated function.
     """
-    try:
-        signature = inspect.signature(func)
-    except ValueError:
-        return func  # We cannot derive signature from provided callable.
-
-    if not any(p for p in signature.parameters.values() if isinstance(p.default, Provider)):
+    if inspect.isclass(func):
+        func.__init__ = patch_method(func.__init__)
         return func
 
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        args, kwargs = patch_args(signature, args, kwargs)
-
-        return func(*args, **kwargs)
+    if (analysis := _analyse(func)) is None or (wrapper := _compile_injector(func, analysis)) is None:
+        return func
 
+    wrapper = functools.wraps(func)(wrapper)
     wrapper._patched_func = func
     return wrapper
 
 
+class Inject(Generic[T]):
+    """
+    A class attribute injected from a provider, resolved lazily on first access.
+
+    Each instance resolves the provider the first time the attribute is accessed and keeps the value, so collaborators
+    a code path never touches are never resolved. The value is kept in the instance `__dict__` (after which this
+    descriptor is bypassed entirely), or in the named `slot` for classes without an instance `__dict__`. Assigning the
+    attribute (or the slot) supplies the value instead, deleting it resolves the provider again on the next access.
+
+    Singletons (and existing singletons) are shared per class rather than kept by each instance, they are evaluated on
+    every access so overrides and resets are always observed. A `Pool` cannot be injected, as nothing would return its
+    instances.
+    """
+
+    __slots__ = ("_provider", "_shared", "_slot", "_member", "_name")
+
+    def __init__(self, provider: Provider[T], *, slot: str | None = None):
+        if isinstance(provider, Pool):
+            raise TypeError("A Pool cannot be a provider argument, inject it into a function or use Pool.checkout().")
+        self._provider = provider
+        self._shared = type(provider) in (Singleton, ExistingSingleton)
+        self._slot = slot
+        self._member: types.MemberDescriptorType | None = None
+        self._name: str | None = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+        if self._shared:
+            return
+
+        if self._slot is not None:
+            self._member = getattr(owner, self._slot, None)
+            if not isinstance(self._member, types.MemberDescriptorType):
+                raise TypeError(f"{owner.__qualname__} has no slot {self._slot!r} to keep {name!r} in.")
+        elif not owner.__dictoffset__:
+            raise TypeError(f"{owner.__qualname__} instances have no __dict__, pass a slot to keep {name!r} in.")
+
+    def __get__(self, instance: Any, owner: type | None = None) -> T:
+        if instance is None:
+            return self
+        if self._shared:
+            return self._provider()
+
+        if self._member is None:
+            value = instance.__dict__[self._name] = self._provider()
+            return value
+
+        try:
+            return self._member.__get__(instance, owner)
+        except AttributeError:
+            value = self._provider()
+            self._member.__set__(instance, value)
+            return value
+
+
 def is_patched(func: Callable | types.FunctionType) -> bool:
     """
     Checks if a function has been "patched" by the `patch_args_decorator`
@@ -107,12 +426,16 @@ def patch_method(func: TCallable) -> TCallable:
     """
     Return a "patched" version of the method provided.
 
-    If no values required patching, the provided function will be returned unchanged.
+    If no values required patching, or the function is already patched, the provided function will be returned
+    unchanged.
 
     :param func: to patch default values.
     :return: a "patched" version of the method provided.
     """
-    if any(1 for param in inspect.signature(func).parameters.values() if isinstance(param.default, Provider)):
+    if is_patched(func):
+        return func
+
+    if _analyse(func) is not None:
         return inject(func)
 
     return func
@@ -130,41 +453,408 @@ def unpatch_method(func: TCallable) -> TCallable:
     return getattr(func, "_patched_func", func)
 
 
-def wire(modules: list[types.ModuleType | str]) -> None:
+class _WiringLoader(importlib.abc.Loader):
+    """
+    Delegates to the real loader, wiring the module once it has been executed.
+    """
+
+    def __init__(self, loader: importlib.abc.Loader):
+        self._loader = loader
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec: importlib.machinery.ModuleSpec) -> types.ModuleType | None:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: types.ModuleType) -> None:
+        self._loader.exec_module(module)
+        module.__loader__ = module.__spec__.loader = self._loader
+        for wiring in _finder.discard(module.__name__):
+            # noinspection PyProtectedMember
+            wiring._wire([module])
+
+
+class _WiringFinder(importlib.abc.MetaPathFinder):
+    """
+    An import hook wiring pending modules as they are imported.
+
+    Only installed on `sys.meta_path` while there are pending modules.
+    """
+
+    def __init__(self):
+        self.pending: dict[str, list[Wiring]] = {}
+        """Each pending module name mapped to the handles wiring it, in the order they were deferred."""
+
+    def add(self, name: str, wiring: Wiring) -> None:
+        if wiring not in (handles := self.pending.setdefault(name, [])):
+            handles.append(wiring)
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def discard(self, name: str, wiring: Wiring | None = None) -> list[Wiring]:
+        """
+        Stop wiring a module on import, for a single handle or (by default) every handle.
+
+        :return: the handles no longer pending the module.
+        """
+        handles = self.pending.get(name, [])
+        if wiring is None or handles == [wiring]:
+            self.pending.pop(name, None)
+        elif wiring in handles:
+            handles.remove(wiring)
+            handles = [wiring]
+        else:
+            handles = []
+        if not self.pending and self in sys.meta_path:
+            sys.meta_path.remove(self)
+        return handles
+
+    def find_spec(self, fullname, path, target=None) -> importlib.machinery.ModuleSpec | None:
+        if fullname not in self.pending:
+            return None
+
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            if (spec := finder.find_spec(fullname, path, target)) is not None:
+                break
+        else:
+            return None
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _WiringLoader(spec.loader)
+        return spec
+
+
+_finder = _WiringFinder()
+
+
+def _functions(cls: type) -> Iterator[tuple[str, Any]]:
+    """
+    Get the functions (and static methods) of a class, including those it inherits.
+
+    Walks the namespaces of the MRO directly rather than `inspect.getmembers`, so no members are sorted, materialized
+    or bound.
+    """
+    seen: set[str] = set()
+    for base in cls.__mro__:
+        for name, obj in list(vars(base).items()):
+            if name not in seen:
+                seen.add(name)
+                if isinstance(obj, types.FunctionType | staticmethod):
+                    yield name, obj
+
+
+def _lookup(owner: types.ModuleType | type, name: str) -> Any:
+    """
+    Get an attribute of a module, or of a class (or the class it inherits it from) without binding it.
+    """
+    if isinstance(owner, type):
+        return next((vars(base)[name] for base in owner.__mro__ if name in vars(base)), None)
+    return vars(owner).get(name) if isinstance(owner, types.ModuleType) else None
+
+
+def _repatch(owner: types.ModuleType | type, name: str, obj: Any, patch: Callable[[Callable], Callable]) -> Callable:
+    """
+    Apply `patch` to a function (or the function of a static method), replacing it on `owner` if it changed.
+
+    :return: the patched function.
+    """
+    func = obj.__func__ if isinstance(obj, staticmethod) else obj
+    if func is not (patched := patch(func)):
+        setattr(owner, name, staticmethod(patched) if isinstance(obj, staticmethod) else patched)
+    return patched
+
+
+class _Patch(NamedTuple):
+    """
+    A function (or static method) attribute that needs wiring.
+    """
+
+    owner: types.ModuleType | type
+    name: str
+    original: Any
+    """The attribute value before wiring."""
+    patched: Any
+    """The attribute value once wired, the `original` if it was already wired."""
+    target: Target
+    inherited: bool
+    """Whether `owner` inherited the attribute rather than defining it."""
+
+    def apply(self) -> bool:
+        """
+        Set the patched value, unless the attribute has changed since it was planned (e.g. already wired).
+
+        :return: True if the attribute was patched.
+        """
+        if self.patched is self.original or _lookup(self.owner, self.name) is not self.original:
+            return False
+        setattr(self.owner, self.name, self.patched)
+        return True
+
+    def restore(self) -> None:
+        """
+        Restore the original value, unless the attribute has since been replaced.
+        """
+        if _lookup(self.owner, self.name) is not self.patched:
+            return
+        if self.inherited:
+            delattr(self.owner, self.name)
+        else:
+            setattr(self.owner, self.name, self.original)
+
+
+def _plan(owner: types.ModuleType | type, name: str, obj: Any, target: Target) -> _Patch | None:
+    """
+    Plan wiring a function (or static method), without modifying `owner`.
+
+    :return: the patch, or None if the function has no Provider defaults.
+    """
+    func = obj.__func__ if isinstance(obj, staticmethod) else obj
+    if not is_patched(patched := patch_method(func)):
+        return None
+    if patched is func:
+        patched = obj
+    elif isinstance(obj, staticmethod):
+        patched = staticmethod(patched)
+    inherited = isinstance(owner, type) and name not in vars(owner)
+    return _Patch(owner, name, obj, patched, target, inherited)
+
+
+def _plan_module(module: types.ModuleType) -> list[_Patch]:
+    """
+    Scan every function and method of a module, planning the patches needed to wire it.
+    """
+    patches = []
+    for name, obj in list(vars(module).items()):
+        if isinstance(obj, types.FunctionType):
+            patches.append(_plan(module, name, obj, (name,)))
+        elif isinstance(obj, type):
+            patches += (_plan(obj, method_name, method, (name, method_name)) for method_name, method in _functions(obj))
+    return [p for p in patches if p is not None]
+
+
+def _plan_targets(module: types.ModuleType, targets: list[Target]) -> list[_Patch] | None:
+    """
+    Plan the patches for only the known functions and methods of a module.
+
+    :return: the patches, or None if any target could not be patched, i.e. the targets are stale.
+    """
+    patches = []
+    for *path, name in targets:
+        owner = module
+        for attr in path:
+            owner = getattr(owner, attr, None)
+        if not isinstance(obj := _lookup(owner, name), types.FunctionType | staticmethod):
+            return None
+        if (patch := _plan(owner, name, obj, (*path, name))) is None:
+            return None
+        patches.append(patch)
+    return patches
+
+
+class Wiring:
+    """
+    A handle on the modules wired by a call to `wire`, recording exactly which attributes were patched.
+
+    Unwiring the handle only restores those attributes rather than scanning the modules again, and `rewire` only
+    re-wires modules that changed since (e.g. reloaded by a development server).
+    """
+
+    __slots__ = ("_cache", "_index", "_records", "_pending", "__weakref__")
+
+    def __init__(self, cache: WiringCache | None = None, index: Index | None = None):
+        self._cache = cache
+        self._index = index
+        self._records: dict[str, tuple[types.ModuleType, dict | None, list[_Patch]]] = {}
+        self._pending: set[str] = set()
+
+    @property
+    def modules(self) -> list[str]:
+        """
+        The names of the wired modules, excluding any still pending lazy wiring.
+        """
+        return list(self._records)
+
+    @property
+    def patched(self) -> int:
+        """
+        The number of attributes patched.
+        """
+        return sum(len(patches) for *_, patches in self._records.values())
+
+    def _scan(self, module: types.ModuleType) -> tuple[list[_Patch], bool]:
+        """
+        Plan the patches for a module, from the index or cache if possible.
+
+        :return: the patches, and whether the module was scanned.
+        """
+        if (
+            self._index is not None
+            and (targets := self._index.get(module.__name__)) is not None
+            and (patches := _plan_targets(module, targets)) is not None
+        ):
+            return patches, False
+        if (
+            self._cache is not None
+            and (targets := self._cache.get(module)) is not None
+            and (patches := _plan_targets(module, targets)) is not None
+        ):
+            return patches, False
+        return _plan_module(module), True
+
+    def _wire(self, modules: list[types.ModuleType], parallel: bool = False) -> None:
+        """
+        Wire modules, planning their patches concurrently on the shared thread pool when `parallel` is set.
+
+        The patches are always applied on the calling thread, in module order.
+        """
+        if parallel and len(modules) > 1:
+            pool = executor()
+            futures = [pool.submit(contextvars.copy_context().run, self._scan, module) for module in modules]
+            plans = (future.result() for future in futures)
+        else:
+            plans = map(self._scan, modules)
+
+        for module, (patches, scanned) in zip(modules, plans, strict=True):
+            if scanned and self._cache is not None:
+                self._cache.set(module, [patch.target for patch in patches])
+            # noinspection PyProtectedMember
+            key = WiringCache._key(module)
+            self._records[module.__name__] = (module, key, [patch for patch in patches if patch.apply()])
+            self._pending.discard(module.__name__)
+
+    def _defer(self, name: str) -> None:
+        """
+        Wire a module through the import hook when it is first imported.
+        """
+        self._pending.add(name)
+        _finder.add(name, self)
+
+    def _changed(self, name: str) -> bool:
+        module, key, patches = self._records[name]
+        # noinspection PyProtectedMember
+        return (
+            sys.modules.get(name) is not module
+            or WiringCache._key(module) != key
+            or any(_lookup(patch.owner, patch.name) is not patch.patched for patch in patches)
+        )
+
+    def _unwire(self, name: str) -> types.ModuleType:
+        module, _, patches = self._records.pop(name)
+        for patch in reversed(patches):
+            patch.restore()
+        return module
+
+    def rewire(self, modules: list[types.ModuleType | str] | None = None, parallel: bool = False) -> list[str]:
+        """
+        Re-wire the wired modules that changed, or the given `modules` (which need not have been wired before).
+
+        A module has changed if it was replaced in `sys.modules`, its source file was modified, or any patched
+        attribute was replaced (e.g. by `importlib.reload`). Its previous patches are restored (where still in place)
+        before it is wired again.
+
+        :param modules: to re-wire, defaults to the wired modules that changed.
+        :param parallel: plan the patches of each module concurrently.
+        :return: the names of the re-wired modules.
+        """
+        if modules is None:
+            names = [name for name in self._records if self._changed(name)]
+        else:
+            names = [m if isinstance(m, str) else m.__name__ for m in modules]
+
+        for name in names:
+            if name in self._records:
+                self._unwire(name)
+        self._wire([sys.modules.get(name) or importlib.import_module(name) for name in names], parallel)
+        return names
+
+    def unwire(self) -> None:
+        """
+        Restore every attribute patched by this handle, and cancel any modules still pending lazy wiring.
+        """
+        for name in self._pending:
+            _finder.discard(name, self)
+        self._pending.clear()
+        for name in reversed(list(self._records)):
+            self._unwire(name)
+
+
+def wire(
+    modules: list[types.ModuleType | str],
+    lazy: bool = False,
+    cache: WiringCache | str | os.PathLike | None = None,
+    parallel: bool = False,
+    index: Index | str | os.PathLike | None = None,
+) -> Wiring:
     """
     Patch all methods in the module containing `Provide` default arguments.
 
+    When `lazy` is set, modules referenced by name that have not yet been imported are not imported here. Instead an
+    import hook wires each of them when (and if) it is first imported, so startup only pays for the modules a process
+    actually uses. Modules that are already imported are always wired immediately.
+
+    When a `cache` (or cache directory) is provided, the functions and methods found to need wiring are recorded on
+    disk. Subsequent processes go straight to those targets rather than scanning every member of an unchanged module.
+
+    When `parallel` is set, the modules are analysed concurrently on the shared thread pool before their patches are
+    applied (in order) on the calling thread. Modules are always imported on the calling thread.
+
+    When an `index` (or index file) built by `analysis.analyse` is provided, only the indexed functions and methods
+    of each module are patched. Modules absent from the index, or whose targets are stale, are scanned as usual.
+
     :param modules: list of modules to wire.
+    :param lazy: defer wiring of modules that have not yet been imported.
+    :param cache: to record and lookup wiring targets.
+    :param parallel: analyse modules concurrently.
+    :param index: of the functions and methods to wire, from static analysis.
+    :return: a handle to unwire (or incrementally re-wire) exactly what was patched.
     """
+    if cache is not None and not isinstance(cache, WiringCache):
+        cache = WiringCache(cache)
+    if isinstance(index, str | os.PathLike):
+        from scottzach1.pif.analysis import Index  # Only imported once needed, along with ast and argparse.
+
+        index = Index.load(index)
+
+    wiring = Wiring(cache, index)
+    imported = []
     for module in modules:
         if isinstance(module, str):
+            if lazy and module not in sys.modules:
+                wiring._defer(module)
+                continue
             module = importlib.import_module(module)
+        imported.append(module)
 
-        for name, obj in inspect.getmembers(module):
-            if inspect.isfunction(obj):
-                if obj is not (patched := patch_method(obj)):
-                    setattr(module, name, patched)
-            elif inspect.isclass(obj):
-                for method_name, method in inspect.getmembers(obj, inspect.isfunction):
-                    if method is not (patched := patch_method(method)):
-                        setattr(obj, method_name, patched)
+    wiring._wire(imported, parallel)
+    return wiring
 
 
-def unwire(modules: list[types.ModuleType]) -> None:
+def unwire(modules: list[types.ModuleType | str] | Wiring) -> None:
     """
     Unpatch all methods in the module containing `Provide` default arguments.
 
-    :param modules: list of modules to wire.
+    Given the `Wiring` handle returned by `wire`, only the attributes it patched are restored without scanning the
+    modules. Otherwise, modules still pending lazy wiring are no longer wired on import (and are not imported here).
+
+    :param modules: list of modules to unwire, or a handle returned by `wire`.
     """
+    if isinstance(modules, Wiring):
+        modules.unwire()
+        return
+
     for module in modules:
         if isinstance(module, str):
+            if module in _finder.pending:
+                _finder.discard(module)
+                continue
             module = importlib.import_module(module)
 
-        for name, obj in inspect.getmembers(module):
-            if inspect.isfunction(obj):
-                if obj is not (unpatched := unpatch_method(obj)):
-                    setattr(module, name, unpatched)
-            elif inspect.isclass(obj):
-                for method_name, method in inspect.getmembers(obj, inspect.isfunction):
-                    if method is not (unpatched := unpatch_method(method)):
-                        setattr(obj, method_name, unpatched)
+        for name, obj in list(vars(module).items()):
+            if isinstance(obj, types.FunctionType):
+                _repatch(module, name, obj, unpatch_method)
+            elif isinstance(obj, type):
+                for method_name, method in _functions(obj):
+                    _repatch(obj, method_name, method, unpatch_method)
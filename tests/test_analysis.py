@@ -0,0 +1,110 @@
+import asyncio
+import importlib
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from scottzach1.pif import analysis, wiring
+
+ROOT = Path(__file__).parent.parent
+PACKAGE = "tests.wired.static"
+EXPECTED = [
+    ("by_alias",),
+    ("by_module",),
+    ("by_container",),
+    ("Base", "method"),
+    ("Base", "static"),
+    ("Child", "method"),
+    ("Child", "static"),
+]
+
+
+def test_find_modules():
+    """
+    Checking a package's modules are located without importing them.
+    """
+    sys.modules.pop(f"{PACKAGE}.services", None)
+
+    modules = analysis.find_modules(PACKAGE, [ROOT])
+
+    assert list(modules) == [PACKAGE, f"{PACKAGE}.deps", f"{PACKAGE}.services"]
+    assert modules[f"{PACKAGE}.services"] == ROOT / "tests" / "wired" / "static" / "services.py"
+    assert f"{PACKAGE}.services" not in sys.modules
+
+    with pytest.raises(ModuleNotFoundError):
+        analysis.find_modules("_pif_missing_package", [ROOT])
+
+
+def test_analyse():
+    """
+    Checking providers are resolved through imports, aliases, containers and provider subclasses.
+    """
+    index = analysis.analyse([PACKAGE], [ROOT])
+
+    assert index.modules == [f"{PACKAGE}.services"]
+    assert index.get(f"{PACKAGE}.deps") == []
+    assert index.get(f"{PACKAGE}.services") == EXPECTED
+    assert index.get("tests.wired.cached_module") is None
+
+
+def test_analyse_matches_runtime():
+    """
+    Checking static analysis finds every runtime target, except defaults only known at runtime.
+    """
+    module = importlib.import_module(f"{PACKAGE}.services")
+    index = analysis.analyse([PACKAGE], [ROOT])
+
+    runtime = [patch.target for patch in wiring._plan_module(module)]
+
+    assert sorted(runtime) == sorted([*EXPECTED, ("by_helper",)])
+    assert set(index.get(module.__name__)) <= set(runtime)
+
+
+def test_wire_index(tmp_path, monkeypatch):
+    """
+    Checking wiring with an index patches the indexed targets without scanning the module.
+    """
+    module = importlib.import_module(f"{PACKAGE}.services")
+    analysis.analyse([PACKAGE], [ROOT]).save(tmp_path / "index.json")
+
+    def scan(module):
+        raise AssertionError("module should not be scanned")
+
+    monkeypatch.setattr(wiring, "_plan_module", scan)
+    handle = wiring.wire([module], index=tmp_path / "index.json")
+    try:
+        assert handle.patched == len(EXPECTED) - 2  # Child inherits the methods patched on Base.
+        assert module.by_container() == ("hello name", "")
+        assert asyncio.run(module.by_module()) == "name"
+        assert module.Child().static() == module.Base().method() == "name"
+        assert not wiring.is_patched(module.by_helper)
+    finally:
+        wiring.unwire(handle)
+
+
+def test_index_version(tmp_path):
+    """
+    Checking an index round trips through its file, and other versions are rejected.
+    """
+    path = tmp_path / "index.json"
+    analysis.Index({"module": [("func",), ("Class", "method")]}).save(path)
+    assert analysis.Index.load(path).targets == {"module": [("func",), ("Class", "method")]}
+
+    path.write_text(json.dumps({"version": 0, "modules": {}}))
+    with pytest.raises(ValueError):
+        analysis.Index.load(path)
+
+
+def test_main(tmp_path, capsys):
+    """
+    Checking the command line reports the injection map and writes the index.
+    """
+    assert analysis.main([PACKAGE, "--path", str(ROOT), "-o", str(tmp_path / "index.json")]) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines == [f"{PACKAGE}.services", *(f"    {'.'.join(target)}" for target in EXPECTED)]
+    assert analysis.Index.load(tmp_path / "index.json").modules == [f"{PACKAGE}.services"]
+
+    assert analysis.main(["_pif_missing_package", "--path", str(ROOT)]) == 1
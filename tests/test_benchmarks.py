@@ -0,0 +1,13 @@
+import pytest
+
+from benchmarks import bench_providers, bench_wiring  # noqa: F401 (registers benchmarks)
+from benchmarks.harness import collect
+
+
+@pytest.mark.parametrize("bench", list(collect()), ids=lambda b: b.name)
+def test_benchmark_smoke(bench):
+    """
+    Check every benchmark can be set up and executed once.
+    """
+    stmt = bench.setup()
+    stmt()
@@ -0,0 +1,84 @@
+import json
+import types
+
+import pytest
+
+from scottzach1.pif import wiring
+from scottzach1.pif.cache import WiringCache
+from tests.wired import cached_module
+
+
+@pytest.fixture(autouse=True)
+def unwired():
+    yield
+    wiring.unwire([cached_module])
+
+
+def test_cache_records_targets(tmp_path):
+    """
+    Checking wiring with a cache records exactly the patched functions and methods.
+    """
+    wiring.wire([cached_module], cache=tmp_path)
+
+    assert cached_module.my_func() == "cached_injected"
+    assert WiringCache(tmp_path).get(cached_module) == [("my_func",), ("Service", "method")]
+
+
+def test_cache_skips_scan(tmp_path, monkeypatch):
+    """
+    Checking a valid cache entry is used instead of scanning the module.
+    """
+    wiring.wire([cached_module], cache=tmp_path)
+    wiring.unwire([cached_module])
+
+    def scan(module):
+        raise AssertionError("module should not be scanned")
+
+    monkeypatch.setattr(wiring, "_plan_module", scan)
+    wiring.wire([cached_module], cache=tmp_path)
+
+    assert cached_module.my_func() == "cached_injected"
+    assert cached_module.Service().method() == "cached_injected"
+    assert not wiring.is_patched(cached_module.plain_func)
+
+
+def test_cache_stale_targets(tmp_path):
+    """
+    Checking stale targets fall back to scanning the module and refresh the entry.
+    """
+    cache = WiringCache(tmp_path)
+    cache.set(cached_module, [("plain_func",)])
+
+    wiring.wire([cached_module], cache=cache)
+
+    assert cached_module.my_func() == "cached_injected"
+    assert cache.get(cached_module) == [("my_func",), ("Service", "method")]
+
+
+def test_cache_key_mismatch(tmp_path):
+    """
+    Checking entries recorded for a different version of the module are ignored.
+    """
+    cache = WiringCache(tmp_path)
+    cache.set(cached_module, [("my_func",)])
+
+    (path,) = tmp_path.glob("*.json")
+    entry = json.loads(path.read_text())
+    entry["key"]["mtime_ns"] -= 1
+    path.write_text(json.dumps(entry))
+
+    assert cache.get(cached_module) is None
+
+
+def test_cache_dynamic_module(tmp_path):
+    """
+    Checking modules without a source file are wired but never cached.
+    """
+    module = types.ModuleType("_pif_dynamic_module")
+    source = "from scottzach1.pif import providers\ndef f(a=providers.ExistingSingleton(1)):\n    return a\n"
+    exec(source, module.__dict__)
+
+    wiring.wire([module], cache=tmp_path)
+
+    assert module.f() == 1
+    assert not list(tmp_path.glob("*.json"))
@@ -0,0 +1,155 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+from scottzach1.pif import providers
+
+
+def counter():
+    """
+    Get a function returning an incrementing value (and its args) on every call.
+    """
+    count = itertools.count()
+    return lambda *args, **kwargs: (next(count), args, kwargs)
+
+
+def test_cached_forever():
+    """
+    Checking cached providers without a ttl construct once.
+    """
+    provider = providers.Cached(counter())
+
+    assert provider() == (0, (), {})
+    assert provider() == (0, (), {})
+
+
+def test_cached_ttl():
+    """
+    Checking cached instances are reconstructed once expired.
+    """
+    provider = providers.Cached(counter(), cache_ttl=0.05)
+
+    assert provider()[0] == 0
+    assert provider()[0] == 0
+    time.sleep(0.06)
+    assert provider()[0] == 1
+
+
+def test_cached_variants_lru():
+    """
+    Checking call args select a variant, evicting the least recently used.
+    """
+    provider = providers.Cached(counter(), "bound", cache_size=2)
+
+    assert provider("a") == (0, ("bound", "a"), {})
+    assert provider("b", k=1) == (1, ("bound", "b"), {"k": 1})
+    assert provider("a")[0] == 0  # "a" is now the most recently used.
+    assert provider("c")[0] == 2  # Evicts "b".
+    assert provider("a")[0] == 0
+    assert provider("b", k=1)[0] == 3
+
+
+def test_cached_variants_distinct():
+    """
+    Checking args never share a variant with kwargs.
+    """
+    provider = providers.Cached(counter())
+
+    assert provider(1, a=2) == (0, (1,), {"a": 2})
+    assert provider((1,), (("a", 2),)) == (1, ((1,), (("a", 2),)), {})
+    assert provider(1, ("a", 2)) == (2, (1, ("a", 2)), {})
+    assert provider(1, a=2)[0] == 0
+
+
+def test_cached_stale_while_revalidate():
+    """
+    Checking expired instances are provided while a replacement is constructed in the background.
+    """
+    release = threading.Event()
+    count = itertools.count()
+
+    def build():
+        value = next(count)
+        if value:
+            release.wait(5)
+        return value
+
+    provider = providers.Cached(build, cache_ttl=0.01, cache_stale=60)
+
+    assert provider() == 0
+    time.sleep(0.02)
+    assert provider() == 0  # Stale, refreshing in the background.
+    assert provider() == 0  # Still refreshing, no second refresh.
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while provider() == 0 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert provider() == 1
+    assert next(count) == 2
+
+
+def test_cached_single_flight():
+    """
+    Checking concurrent evaluations share a single construction.
+    """
+    calls = []
+
+    def build():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    provider = providers.Cached(build)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(provider())) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_cached_errors_not_cached():
+    """
+    Checking failed constructions are retried.
+    """
+    calls = []
+
+    def build():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ValueError()
+        return "ok"
+
+    provider = providers.Cached(build)
+
+    with pytest.raises(ValueError):
+        provider()
+    assert provider() == "ok"
+
+
+def test_cached_invalidation():
+    """
+    Checking cached instances are discarded when a dependency is overridden.
+    """
+    leaf = providers.ExistingSingleton("leaf")
+    provider = providers.Cached(lambda v: [v], leaf)
+
+    assert provider() == ["leaf"]
+    with leaf.override_existing("overridden"):
+        assert provider() == ["overridden"]
+
+
+def test_cached_override_existing():
+    """
+    Checking parameterized providers can be overridden with existing values.
+    """
+    provider = providers.Cached(counter())
+
+    with provider.override_existing("mock"):
+        assert provider("a") == "mock"
@@ -0,0 +1,118 @@
+import pytest
+
+from scottzach1.pif import containers, providers
+
+
+class Services(containers.Container):
+    domain = providers.ExistingSingleton("example.com")
+    token = providers.Blank()
+    client = providers.Singleton(lambda domain, token: (domain, token, object()), domain, token=token)
+
+
+class ExtendedServices(Services):
+    timeout = providers.ExistingSingleton(5)
+
+
+def test_container_providers():
+    """
+    Checking containers collect providers from the class and its bases.
+    """
+    assert Services.providers == {"domain": Services.domain, "token": Services.token, "client": Services.client}
+    assert list(ExtendedServices.providers) == ["domain", "token", "client", "timeout"]
+
+    with pytest.raises(TypeError):
+        Services()
+
+
+def test_container_override():
+    """
+    Checking containers override many providers at once, and disable them all on exit.
+    """
+    with Services.override_existing({"domain": "test.com", Services.token: "secret"}) as overrides:
+        assert isinstance(overrides, containers.Overrides)
+        assert Services.domain() == "test.com"
+        assert Services.token() == "secret"
+
+        with Services.override({"domain": providers.ExistingSingleton("nested.com")}):
+            assert Services.domain() == "nested.com"
+
+        assert Services.domain() == "test.com"
+
+    assert Services.domain() == "example.com"
+
+    with pytest.raises(KeyError):
+        Services.override({"missing": None})
+
+    with pytest.raises(KeyError):
+        Services.override_existing({"domain": "partial.com", "missing": None})
+    assert Services.domain() == "example.com"
+
+
+def test_container_local_override():
+    """
+    Checking containers locally override many providers once entered.
+    """
+    local = Services.local_override({"domain": providers.ExistingSingleton("local.com")})
+    assert Services.domain() == "example.com"
+
+    with local:
+        assert Services.domain() == "local.com"
+
+    assert Services.domain() == "example.com"
+
+
+def test_container_reset():
+    """
+    Checking containers reset all cached singletons.
+    """
+    with Services.override_existing({"token": "secret"}):
+        client = Services.client()
+        assert Services.client() is client
+
+        Services.reset()
+        assert Services.client() is not client
+
+    Services.reset()
+
+
+def test_container_snapshot_restore():
+    """
+    Checking containers restore overrides and cached singletons from a snapshot.
+    """
+    Services.reset()
+    override = Services.override_existing({"token": "tenant_1"})
+    tenant_1 = Services.client()
+    snapshot = Services.snapshot()
+
+    Services.override_existing({"token": "tenant_2", "domain": "tenant2.com"})
+    Services.reset()
+    tenant_2 = Services.client()
+    assert tenant_2[:2] == ("tenant2.com", "tenant_2")
+
+    Services.restore(snapshot)
+    assert Services.token() == "tenant_1"
+    assert Services.domain() == "example.com"
+    assert Services.client() is tenant_1
+
+    override.disable()
+    Services.reset()
+
+
+def test_container_restore_dependent_first():
+    """
+    Checking restoring a dependency's override does not discard the restored instance of a dependent declared first.
+    """
+
+    class Reversed(containers.Container):
+        client = providers.Singleton(lambda token: (token, object()), Services.token)
+        token = Services.token
+
+    with Reversed.override_existing({"token": "tenant_1"}):
+        tenant_1 = Reversed.client()
+        snapshot = Reversed.snapshot()
+
+        Reversed.override_existing({"token": "tenant_2"})
+        assert Reversed.client()[0] == "tenant_2"
+
+        Reversed.restore(snapshot)
+        assert Reversed.client() is tenant_1
@@ -0,0 +1,201 @@
+import sys
+import threading
+import types
+
+import pytest
+
+from scottzach1.pif import exceptions, graph, providers, wiring
+from scottzach1.pif.providers.singleton import UNSET
+
+
+def test_dependencies():
+    """
+    Checking providers expose the providers they were constructed with.
+    """
+    a = providers.ExistingSingleton("a")
+    b = providers.Factory(lambda: "b")
+    c = providers.Singleton(lambda *_, **__: None, a, "static", key=b)
+
+    assert a.dependencies == ()
+    assert b.dependencies == ()
+    assert c.dependencies == (a, b)
+
+
+def test_build_graph_order():
+    """
+    Checking the graph orders dependencies before their dependents.
+    """
+    a = providers.ExistingSingleton("a")
+    b = providers.Factory(lambda v: v, a)
+    c = providers.Singleton(lambda *_: None, a, b)
+    d = providers.Factory(lambda *_: None, c, b)
+
+    result = graph.build_graph([d])
+
+    assert list(result) == [a, b, c, d]
+    assert result[d] == (c, b)
+
+
+def test_build_graph_override():
+    """
+    Checking an overridden provider only depends on its override.
+    """
+    a = providers.Factory(lambda: "a")
+    b = providers.Factory(lambda v: v, a)
+    c = providers.ExistingSingleton("c")
+
+    with b.override(c):
+        assert graph.build_graph([b]) == {c: (), b: (c,)}
+
+    assert graph.build_graph([b]) == {a: (), b: (a,)}
+
+
+def test_build_graph_cycle():
+    """
+    Checking cycles are reported.
+    """
+    a = providers.Blank()
+    b = providers.Factory(lambda v: v, a)
+    a.override(b)
+
+    with pytest.raises(exceptions.CircularDependencyException):
+        graph.build_graph([b])
+
+
+def test_build_graph_module():
+    """
+    Checking modules contribute top level providers and provider default arguments.
+    """
+    module = types.ModuleType("_pif_graph_module")
+    exec(
+        "from scottzach1.pif import providers\n"
+        "A = providers.ExistingSingleton('a')\n"
+        "B = providers.ExistingSingleton('b')\n"
+        "def f(v=providers.Factory(lambda v: v, B)): ...\n"
+        "class C:\n"
+        "    def m(self, v=A): ...\n",
+        module.__dict__,
+    )
+    sys.modules[module.__name__] = module
+    try:
+        wiring.wire([module.__name__])
+        result = graph.build_graph([module.__name__])
+    finally:
+        del sys.modules[module.__name__]
+
+    assert module.A in result
+    assert module.B in result
+    assert len(result) == 3
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_warm_up(parallel):
+    """
+    Checking all reachable singletons are evaluated after their dependencies.
+    """
+    order = []
+    lock = threading.Lock()
+
+    def build(name, *deps):
+        with lock:
+            assert all(d in order for d in deps)
+            order.append(name)
+        return name
+
+    a = providers.Singleton(build, "a")
+    b = providers.Singleton(build, "b")
+    c = providers.Singleton(build, "c", a, b)
+    d = providers.Factory(build, "d", c)
+    e = providers.Singleton(build, "e", d)
+    per_thread = providers.Singleton(build, "f", singleton_thread_mode="per-thread")
+
+    warmed = graph.warm_up([e, per_thread], parallel=parallel)
+
+    assert set(warmed) == {a, b, c, e}
+    assert sorted(order) == ["a", "b", "c", "d", "e"]
+    assert e() == "e"
+    assert len(order) == 5
+
+
+def test_flatten():
+    """
+    Checking a flattened resolver evaluates the same values as the root provider, constructing singletons once.
+    """
+    calls = []
+    a = providers.Singleton(lambda: calls.append("a") or "a")
+    b = providers.Factory(lambda x, y: (x, y), a, y=providers.ExistingSingleton("y"))
+    c = providers.Factory(lambda *args, **kwargs: (args, kwargs), b, b, "static", key=b)
+
+    resolve = graph.flatten(c)
+
+    assert resolve() == c() == ((("a", "y"), ("a", "y"), "static"), {"key": ("a", "y")})
+    assert resolve() is not resolve()
+    assert calls == ["a"]
+
+
+def test_flatten_override():
+    """
+    Checking a flattened resolver follows global and local overrides, and their removal.
+    """
+    a = providers.Factory(lambda: "a")
+    b = providers.Factory(lambda v: v.upper(), a)
+    resolve = graph.flatten(b)
+
+    assert resolve() == "A"
+    with a.override_existing("x"):
+        assert resolve() == "X"
+    assert resolve() == "A"
+
+    with b.local_override_existing("local"):
+        assert resolve() == "local"
+    assert resolve() == "A"
+
+
+def test_flatten_recompiles_tree_only(monkeypatch):
+    """
+    Checking a flattened resolver is only regenerated when a provider in its tree is overridden.
+    """
+    compiled = []
+    compile_resolver = graph._compile_resolver
+    monkeypatch.setattr(graph, "_compile_resolver", lambda *args: compiled.append(args[0]) or compile_resolver(*args))
+
+    a = providers.Factory(lambda: "a")
+    resolve = graph.flatten(providers.Factory(lambda v: v.upper(), a))
+    unrelated = providers.Factory(lambda: "unrelated")
+
+    with unrelated.local_override_existing("x"), unrelated.override_existing("y"):
+        assert resolve() == "A"
+    assert len(compiled) == 1
+
+    with a.override_existing("x"):
+        assert resolve() == resolve() == "X"
+    assert resolve() == "A"
+    assert len(compiled) == 3
+
+
+def test_flatten_singleton_invalidated():
+    """
+    Checking a flattened resolver reads the current instance of a reset singleton.
+    """
+    a = providers.Singleton(object)
+    resolve = graph.flatten(providers.Factory(lambda v: v, a))
+
+    first = resolve()
+    assert resolve() is first
+    a.reset()
+    assert resolve() is not first
+
+
+def test_prefork():
+    """
+    Checking only fork safe singletons (not depending on fork unsafe singletons) are evaluated before forking.
+    """
+    unsafe = providers.Singleton(object, singleton_fork_safe=False)
+    safe = providers.Singleton(object)
+    tainted = providers.Singleton(lambda *_: object(), safe, unsafe)
+    root = providers.Factory(lambda *_: None, safe, tainted)
+
+    assert graph.prefork([root]) == [safe]
+    assert safe._result is not UNSET
+    assert unsafe._result is UNSET
+    assert tainted._result is UNSET
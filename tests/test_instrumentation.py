@@ -0,0 +1,88 @@
+import pytest
+
+from scottzach1.pif import exceptions, instrumentation, providers
+
+
+@pytest.fixture(autouse=True)
+def clean():
+    instrumentation.reset()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def _stats(provider: providers.Provider) -> dict:
+    (stats,) = (s for s in instrumentation.snapshot() if s["id"] == id(provider))
+    return stats
+
+
+def test_disabled_by_default():
+    """
+    Checking nothing is recorded (or patched) unless enabled.
+    """
+    provider = providers.Factory(object)
+    provider()
+
+    assert not instrumentation.is_enabled()
+    assert instrumentation.snapshot() == []
+
+
+def test_counts():
+    """
+    Checking calls, singleton hits and misses, overrides and depth are recorded.
+    """
+
+    def leaf():
+        return "leaf"
+
+    leaf_provider = providers.Factory(leaf)
+    singleton = providers.Singleton(lambda v: v, leaf_provider)
+
+    with instrumentation.instrumented():
+        singleton()
+        singleton()
+        with singleton.override_existing("override"):
+            singleton()
+
+    singleton()  # Disabled, not recorded.
+
+    stats = _stats(singleton)
+    assert stats["type"] == "Singleton"
+    assert stats["calls"] == 3
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["overridden"] == 1
+    assert stats["max_depth"] == 1
+    assert stats["latency_ns"]["total"] >= stats["latency_ns"]["max"] >= stats["latency_ns"]["min"] >= 0
+    assert sum(stats["latency_ns"]["buckets"].values()) == 3
+
+    stats = _stats(leaf_provider)
+    assert stats["provider"] == "Factory(test_counts.<locals>.leaf)"
+    assert stats["calls"] == 1
+    assert stats["hits"] == stats["misses"] == 0
+    assert stats["max_depth"] == 2
+
+
+def test_errors():
+    """
+    Checking failed evaluations are recorded.
+    """
+    provider = providers.Blank()
+
+    with instrumentation.instrumented(), pytest.raises(exceptions.BlankProviderException):
+        provider()
+
+    assert _stats(provider)["errors"] == 1
+
+
+def test_snapshot_reset():
+    """
+    Checking snapshots can reset the recorded statistics.
+    """
+    provider = providers.ExistingSingleton(1)
+
+    with instrumentation.instrumented():
+        provider()
+
+    assert len(instrumentation.snapshot(reset=True)) == 1
+    assert instrumentation.snapshot() == []
@@ -0,0 +1,122 @@
+import contextvars
+import threading
+import time
+
+import pytest
+
+from scottzach1.pif import providers, wiring
+
+
+def client(region, name=None):
+    return {"region": region, "name": name}
+
+
+def test_multiton_per_key():
+    """
+    Checking multitons construct once per key, appending the key to the bound args.
+    """
+    provider = providers.Multiton(lambda prefix, key: {"id": f"{prefix}-{key}"}, "client")
+
+    us = provider("us")
+    assert us == {"id": "client-us"}
+    assert provider("us") is us
+    assert provider("eu") is not us
+    assert provider.keys() == ["us", "eu"]
+
+
+def test_multiton_context_key():
+    """
+    Checking multitons read the key from a context variable when injected.
+    """
+    region = contextvars.ContextVar("region")
+    provider = providers.Multiton(client, name="api", multiton_key=region)
+
+    @wiring.inject
+    def handler(c=provider):
+        return c
+
+    token = region.set("us")
+    try:
+        assert handler() == {"region": "us", "name": "api"}
+        assert handler() is provider("us")
+    finally:
+        region.reset(token)
+
+    with pytest.raises(LookupError):
+        handler()
+
+
+def test_multiton_requires_key():
+    """
+    Checking multitons without a context variable require a key.
+    """
+    with pytest.raises(TypeError):
+        providers.Multiton(client)()
+
+
+def test_multiton_bounded():
+    """
+    Checking multitons evict the oldest instance once full.
+    """
+    provider = providers.Multiton(client, multiton_size=2)
+
+    us = provider("us")
+    provider("eu")
+    provider("ap")
+
+    assert provider.keys() == ["eu", "ap"]
+    assert provider("us") is not us
+
+    with pytest.raises(ValueError):
+        providers.Multiton(client, multiton_size=0)
+
+
+def test_multiton_concurrent():
+    """
+    Checking concurrent evaluations construct once per key.
+    """
+    calls = []
+
+    def build(key):
+        calls.append(key)
+        time.sleep(0.02)
+        return object()
+
+    provider = providers.Multiton(build)
+    results = []
+    threads = [threading.Thread(target=lambda k=k: results.append((k, provider(k)))) for k in "aabb"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(calls) == ["a", "b"]
+    assert len({id(obj) for _, obj in results}) == 2
+
+
+def test_multiton_reset():
+    """
+    Checking multitons discard all instances on reset and when a dependency is overridden.
+    """
+    name = providers.ExistingSingleton("api")
+    provider = providers.Multiton(client, name=name)
+
+    us = provider("us")
+    provider.reset()
+    assert provider("us") is not us
+
+    with name.override_existing("overridden"):
+        assert provider("us") == {"region": "us", "name": "overridden"}
+
+
+def test_multiton_override_plain():
+    """
+    Checking a multiton overridden by an unparameterized provider evaluates it without the key.
+    """
+    provider = providers.Multiton(client)
+
+    with provider.override(providers.Factory(dict, region="overridden")):
+        assert provider("us") == {"region": "overridden"}
+
+    with provider.override(providers.Multiton(lambda key: key.upper())):
+        assert provider("us") == "US"
@@ -1,8 +1,14 @@
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
 from collections import namedtuple
 
 import pytest
 
-from scottzach1.pif import exceptions, providers
+from scottzach1.pif import exceptions, graph, providers, tracing
+from scottzach1.pif.providers import util
 
 
 def test_override_standard_shallow():
@@ -285,7 +291,7 @@ def test_transitive_singleton_wired():
 
 def test_transitive_singleton_override():
     """
-    Checking the singleton provide retains cached value even when Provider arg and kwarg is overridden.
+    Checking the singleton provider is invalidated when a Provider arg or kwarg is overridden.
     """
     model = namedtuple("Model", "a b")
 
@@ -306,4 +312,520 @@ def test_transitive_singleton_override():
         provider_a.override_existing("b"),
         provider_b.override_existing("a"),
     ):
-        assert model_1 == provider()  # Overriding does not change the cached value.
+        model_3 = provider()
+        assert model("b", "a") == model_3
+        assert model_3 is provider()
+
+    model_4 = provider()
+    assert model("a", "b") == model_4
+    assert model_4 is not model_1
+
+
+def test_transitive_singleton_override_never():
+    """
+    Checking the singleton provide retains cached value when Provider arg and kwarg is overridden if requested.
+    """
+    model = namedtuple("Model", "a b")
+
+    provider_a = providers.Singleton(lambda: "a")
+    provider_b = providers.Singleton(lambda: "b")
+
+    provider = providers.Singleton(model, provider_a, provider_b, singleton_invalidate="never")
+    model_1 = provider()
+
+    with (
+        provider_a.override_existing("b"),
+        provider_b.override_existing("a"),
+    ):
+        assert model_1 is provider()  # Overriding does not change the cached value.
+
+
+def test_transitive_singleton_invalidation_subgraph():
+    """
+    Checking only singletons (transitively) depending on an overridden provider are invalidated.
+    """
+    leaf = providers.ExistingSingleton("leaf")
+    other = providers.Singleton(object)
+    factory = providers.Factory(lambda v: v, leaf)
+    direct = providers.Singleton(lambda v: [v], factory)
+    transitive = providers.Singleton(lambda v, _: [v], direct, other)
+
+    other_1, direct_1, transitive_1 = other(), direct(), transitive()
+
+    override = leaf.override_existing("overridden")
+    assert other() is other_1
+    assert direct() == ["overridden"]
+    assert direct() is not direct_1
+    assert transitive() == [["overridden"]]
+    assert transitive() is not transitive_1
+
+    # Overriding the override also invalidates.
+    with override._override.override_existing("nested"):
+        assert transitive() == [["nested"]]
+
+    override.disable()
+    assert transitive() == [["leaf"]]
+
+
+def test_transitive_singleton_invalidation_eager():
+    """
+    Checking eagerly invalidated singletons are rebuilt in the background.
+    """
+    leaf = providers.ExistingSingleton("leaf")
+    rebuilt = threading.Event()
+
+    def build(v):
+        rebuilt.set()
+        return v
+
+    provider = providers.Singleton(build, leaf, singleton_invalidate=providers.Invalidation.EAGER)
+    assert provider() == "leaf"
+    rebuilt.clear()
+
+    with leaf.override_existing("overridden"):
+        assert rebuilt.wait(5)
+        assert provider() == "overridden"
+
+
+def _race(provider: providers.Provider, threads: int = 8) -> list:
+    """
+    Evaluate a provider from many threads at once, returning each threads result.
+    """
+    barrier = threading.Barrier(threads)
+    results = [None] * threads
+
+    def target(i: int):
+        barrier.wait()
+        results[i] = provider()
+
+    workers = [threading.Thread(target=target, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results
+
+
+def test_singleton_thread_mode_lock():
+    """
+    Checking the singleton provider constructs exactly once when threads race the first evaluation.
+    """
+    calls = []
+
+    def build():
+        calls.append(1)
+        time.sleep(0.01)
+        return object()
+
+    provider = providers.Singleton(build)
+    results = _race(provider)
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_singleton_thread_mode_per_thread():
+    """
+    Checking the per-thread singleton provider constructs once per thread.
+    """
+    provider = providers.Singleton(object, singleton_thread_mode=providers.ThreadMode.PER_THREAD)
+    results = _race(provider, threads=4)
+
+    assert len({id(r) for r in results}) == 4
+    assert provider() is provider()
+
+
+def test_singleton_thread_mode_invalid():
+    """
+    Checking an unknown thread mode is rejected.
+    """
+    with pytest.raises(ValueError):
+        providers.Singleton(object, singleton_thread_mode="sometimes")
+
+
+def test_async_factory():
+    """
+    Checking the async factory provider concurrently awaits Provider args and kwargs.
+    """
+    model = namedtuple("Model", "a b c")
+    started = []
+
+    async def slow(v):
+        started.append(v)
+        await asyncio.sleep(0.01)
+        assert len(started) == 2  # Both dependencies started before either finished.
+        return v
+
+    provider = providers.AsyncFactory(
+        model,
+        providers.AsyncFactory(slow, "a"),
+        b=providers.AsyncFactory(slow, "b"),
+        c=providers.Factory(lambda: "c"),
+    )
+
+    async def main():
+        model_1 = await provider()
+        started.clear()
+        model_2 = await provider()
+        return model_1, model_2
+
+    model_1, model_2 = asyncio.run(main())
+    assert model_1 == model("a", "b", "c")
+    assert model_1 == model_2
+    assert model_1 is not model_2
+
+
+def test_async_singleton():
+    """
+    Checking the async singleton provider coalesces concurrent first awaits into a single construction.
+    """
+    calls = []
+
+    async def build():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    provider = providers.AsyncSingleton(build)
+
+    async def main():
+        return await asyncio.gather(*(provider() for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert asyncio.run(provider()) is results[0]
+
+
+def test_async_singleton_retry():
+    """
+    Checking the async singleton provider retries construction after a failure.
+    """
+    calls = []
+
+    async def build():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("first attempt")
+        return "ok"
+
+    provider = providers.AsyncSingleton(build)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(provider())
+
+    assert asyncio.run(provider()) == "ok"
+    assert asyncio.run(provider()) == "ok"
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("cls, keyword", [(providers.Factory, "factory"), (providers.Singleton, "singleton")])
+def test_parallel_arguments(cls, keyword):
+    """
+    Checking parallel providers evaluate their Provider args and kwargs concurrently.
+    """
+    model = namedtuple("Model", "a b c")
+    barrier = threading.Barrier(3, timeout=5)
+
+    def slow(v):
+        barrier.wait()  # Only passes once all three dependencies are being evaluated at the same time.
+        return v
+
+    parallel = {f"{keyword}_parallel": True}
+    provider = cls(model, providers.Factory(slow, "a"), providers.Factory(slow, "b"), c=cls(slow, "c"), **parallel)
+
+    assert provider() == model("a", "b", "c")
+
+
+def test_parallel_arguments_errors():
+    """
+    Checking parallel providers propagate the exception of the first failing argument.
+    """
+    calls = []
+
+    def fail(v):
+        time.sleep(0.01 * (3 - v))
+        calls.append(v)
+        raise ValueError(v)
+
+    provider = providers.Factory(
+        lambda *_, **__: None,
+        providers.Factory(lambda: "ok"),
+        providers.Factory(fail, 1),
+        b=providers.Factory(fail, 2),
+        factory_parallel=True,
+    )
+
+    with pytest.raises(ValueError) as e:
+        provider()
+
+    assert e.value.args == (1,)
+    assert sorted(calls) == [1, 2]
+
+
+def test_reserved_keywords():
+    """
+    Checking providers forward unprefixed keywords, but refuse a func taking a keyword they reserve rather than
+    silently swallowing it.
+    """
+
+    def build(name, /, parallel=False, *, invalidate=None, cache_size=None):
+        return name, parallel, invalidate, cache_size
+
+    assert providers.Factory(build, "a", parallel=True)() == ("a", True, None, None)
+    assert providers.Singleton(build, "a", parallel=True, invalidate="x")() == ("a", True, "x", None)
+
+    def reserved(factory_parallel=False, *, singleton_fork_safe=True, pool_timeout=None, multiton_key=None):
+        pass
+
+    for cls, keywords in (
+        (providers.Factory, "'factory_parallel'"),
+        (providers.Singleton, "'singleton_fork_safe'"),
+        (providers.Pool, "'pool_timeout'"),
+        (providers.Multiton, "'multiton_key'"),
+    ):
+        with pytest.raises(TypeError, match=keywords):
+            cls(reserved)
+    with pytest.raises(TypeError, match="'cache_size'"):
+        providers.Cached(build, "a", cache_size=5)
+
+    assert providers.Factory(lambda factory_parallel, /: factory_parallel, "x")() == "x"
+
+
+def test_override_contextmanager_returns_override():
+    """
+    Checking the override context manager returns the override itself.
+    """
+    provider = providers.ExistingSingleton("a")
+
+    with provider.override_existing("b") as override:
+        assert isinstance(override, providers.Override)
+        assert provider() == "b"
+
+    assert provider() == "a"
+
+
+def test_local_override_nested():
+    """
+    Checking local overrides nest, unwind, and take precedence over global overrides.
+    """
+    provider = providers.ExistingSingleton("a")
+
+    with provider.local_override_existing("b") as override:
+        assert isinstance(override, providers.LocalOverride)
+        assert provider() == "b"
+
+        with provider.local_override_existing("c"):
+            assert provider() == "c"
+
+            with provider.override_existing("global"):
+                assert provider() == "c"
+
+                with provider.local_override(None):
+                    assert provider() == "a"  # Locally disables any override.
+
+            assert provider() == "c"
+
+        assert provider() == "b"
+
+    assert provider() == "a"
+    assert provider._override is None  # Fast path restored.
+
+
+def test_local_override_threads():
+    """
+    Checking local overrides only apply to the current thread.
+    """
+    provider = providers.ExistingSingleton("a")
+    barrier = threading.Barrier(2, timeout=5)
+    results = {}
+
+    def target(value):
+        with provider.local_override_existing(value):
+            barrier.wait()
+            results[value] = provider()
+            barrier.wait()
+
+    workers = [threading.Thread(target=target, args=(v,)) for v in ("b", "c")]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert results == {"b": "b", "c": "c"}
+    assert provider() == "a"
+
+
+def test_local_override_singleton_not_cached():
+    """
+    Checking a singleton built while a dependency is locally overridden never leaks into other threads.
+    """
+    config = providers.ExistingSingleton("global")
+    client = providers.Singleton(lambda c: [c], providers.Factory(str.upper, config))
+    flattened = graph.flatten(providers.Factory(lambda v: v, client))
+    results = {}
+
+    def tenant():
+        with config.local_override_existing("tenant"):
+            results["tenant"] = (client(), client(), flattened())
+
+    worker = threading.Thread(target=tenant)
+    worker.start()
+    worker.join()
+
+    assert [r[0] for r in results["tenant"]] == ["TENANT", "TENANT", "TENANT"]
+    assert client() == flattened() == ["GLOBAL"]
+    assert client() is client()
+    assert not client._local_upstream
+
+    with config.local_override_existing("tenant"):
+        assert client() == ["TENANT"]
+    assert client() == ["GLOBAL"]
+
+
+def test_local_override_tasks():
+    """
+    Checking local overrides only apply to the current asyncio task.
+    """
+    provider = providers.ExistingSingleton("a")
+
+    async def task(value):
+        with provider.local_override_existing(value):
+            await asyncio.sleep(0.01)
+            return provider()
+
+    async def main():
+        return await asyncio.gather(task("b"), task("c"))
+
+    assert asyncio.run(main()) == ["b", "c"]
+    assert provider() == "a"
+
+
+def test_factory_mixed_arguments():
+    """
+    Checking the factory provider substitutes only the Provider args and kwargs, preserving their order.
+    """
+    provider_b = providers.Factory(lambda: "b")
+    provider_d = providers.Factory(lambda: "d")
+    provider = providers.Factory(lambda *args, **kwargs: (args, kwargs), "a", provider_b, c="c", d=provider_d)
+
+    assert provider() == (("a", "b"), {"c": "c", "d": "d"})
+
+    with provider_b.override_existing("B"):
+        assert provider() == (("a", "B"), {"c": "c", "d": "d"})
+
+    assert providers.Factory(dict, a=1)() == {"a": 1}
+    assert providers.Factory(list)() == []
+
+
+def test_factory_many():
+    """
+    Checking a batch resolves the factory arguments once, sharing them between every value.
+    """
+    dependency = providers.Factory(object)
+    provider = providers.Factory(lambda dep, key="default": (dep, key), dependency)
+
+    values = provider.many(3)
+    assert len(values) == 3
+    assert values[0][0] is values[1][0] is values[2][0]
+    assert values[0] is not values[1]
+
+    assert [key for _, key in provider.map([{"key": "a"}, {"key": "b"}])] == ["a", "b"]
+
+    lazy = provider.many(2, lazy=True)
+    assert not isinstance(lazy, list)
+    assert len(list(lazy)) == 2
+
+
+def test_factory_many_override():
+    """
+    Checking a batch evaluates the override of an overridden factory.
+    """
+    provider = providers.Factory(object)
+
+    with provider.override_existing("overridden"):
+        assert provider.many(2) == ["overridden", "overridden"]
+
+    with provider.local_override(providers.Factory(lambda key=0: key)):
+        assert provider.map([{"key": 1}, {"key": 2}]) == [1, 2]
+
+
+def test_factory_many_pool():
+    """
+    Checking a batch can be constructed in a process pool, preserving order.
+    """
+    provider = providers.Factory(complex, providers.ExistingSingleton(1))
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as pool:
+        values = provider.map(({"imag": i} for i in range(100)), pool=pool, chunksize=8)
+
+    assert values == [complex(1, i) for i in range(100)]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_singleton_fork_safety():
+    """
+    Checking forked children keep fork safe singletons, but discard fork unsafe singletons and their (caching)
+    dependents, without tearing down resources owned by the parent, nor inheriting instances checked out of a pool.
+    """
+    teardowns = []
+
+    def resource(v):
+        yield [v]
+        teardowns.append(v)
+
+    safe = providers.Singleton(object)
+    unsafe = providers.Singleton(object, singleton_fork_safe=False)
+    dependent = providers.Singleton(lambda v: [v], unsafe)
+    caching = (
+        providers.Cached(lambda v: [v], unsafe),
+        providers.Multiton(lambda v, key: [v], unsafe),
+        providers.Resource(resource, unsafe),
+    )
+    pool = providers.Pool(object, pool_size=1, pool_timeout=0)
+    parent = (safe(), unsafe(), dependent(), pool())
+    cached = (caching[0](), caching[1]("key"), caching[2]())
+    util.executor().submit(lambda: None).result()  # The child cannot use the parent's pool threads.
+
+    read, write = os.pipe()
+    if (pid := os.fork()) == 0:  # pragma: no cover (child)
+        try:
+            child = (safe(), unsafe(), dependent())
+            ok = child[0] is parent[0] and child[1] is not parent[1] and child[2][0] is child[1]
+            ok = ok and all(v[0] is child[1] for v in (caching[0](), caching[1]("key"), caching[2]())) and not teardowns
+            ok = ok and util.executor().submit(lambda: True).result(timeout=5)
+            ok = ok and pool() is not parent[3]
+            os.write(write, b"1" if ok else b"0")
+        finally:
+            os._exit(0)
+
+    os.close(write)
+    result = os.read(read, 1)
+    os.close(read)
+    os.waitpid(pid, 0)
+
+    assert result == b"1"
+    assert (safe(), unsafe(), dependent()) == parent[:3]
+    with pytest.raises(exceptions.PoolExhaustedException):
+        pool()
+    assert all(a is b for a, b in zip((caching[0](), caching[1]("key"), caching[2]()), cached, strict=True))
+
+
+def test_map_traced():
+    """
+    Checking a batch reports each value to registered tracers, and kwargs are rejected by providers not taking any.
+    """
+    provider = providers.Factory(dict, a=1)
+    tracer = tracing.ResolutionTracer()
+
+    with tracing.traced(tracer):
+        assert provider.map([{"b": 2}, {"b": 3}]) == [{"a": 1, "b": 2}, {"a": 1, "b": 3}]
+        assert providers.Singleton(object).many(2)
+
+        with pytest.raises(TypeError, match="does not accept kwargs"):
+            providers.Singleton(object).map([{"x": 1}])
+
+    assert [span.name for span in tracer.roots[:2]] == ["Factory(dict)", "Factory(dict)"]
+
+    with pytest.raises(TypeError, match="does not accept kwargs"):
+        providers.Singleton(object).map([{"x": 1}])
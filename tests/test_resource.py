@@ -0,0 +1,158 @@
+import contextlib
+import threading
+
+import pytest
+
+from scottzach1.pif import exceptions, providers, wiring
+
+
+def test_resource_generator():
+    """
+    Checking generator resources are set up once and torn down on shutdown.
+    """
+    events = []
+
+    def resource(name):
+        events.append("setup")
+        yield name
+        events.append("teardown")
+
+    provider = providers.Resource(resource, "value")
+
+    assert provider() == "value"
+    assert provider() == "value"
+    assert events == ["setup"]
+
+    provider.shutdown()
+    assert events == ["setup", "teardown"]
+
+    assert provider() == "value"
+    assert events == ["setup", "teardown", "setup"]
+    provider.shutdown()
+    provider.shutdown()
+    assert events == ["setup", "teardown", "setup", "teardown"]
+
+
+def test_resource_context_manager():
+    """
+    Checking context manager resources are entered once and exited on shutdown.
+    """
+    events = []
+
+    @contextlib.contextmanager
+    def resource():
+        events.append("enter")
+        yield "value"
+        events.append("exit")
+
+    provider = providers.Resource(resource)
+
+    assert provider() == "value"
+    assert provider() == "value"
+    provider.shutdown()
+    assert events == ["enter", "exit"]
+
+
+def test_resource_plain_value():
+    """
+    Checking resources returning plain values behave like singletons.
+    """
+    provider = providers.Resource(object)
+
+    assert provider() is provider()
+
+
+def test_pool_reuse():
+    """
+    Checking pooled instances are reused once released.
+    """
+    provider = providers.Pool(object, pool_size=2)
+
+    with provider.checkout() as obj_1, provider.checkout() as obj_2:
+        assert obj_1 is not obj_2
+
+    with provider.checkout() as obj_3:
+        assert obj_3 in (obj_1, obj_2)
+
+
+def test_pool_exhausted():
+    """
+    Checking evaluating an exhausted pool times out.
+    """
+    provider = providers.Pool(object, pool_size=1, pool_timeout=0.01)
+
+    provider()
+    with pytest.raises(exceptions.PoolExhaustedException):
+        provider()
+
+
+def test_pool_bounded():
+    """
+    Checking evaluating an exhausted pool blocks until an instance is released.
+    """
+    calls = []
+    provider = providers.Pool(lambda: calls.append(1) or object(), pool_size=1)
+
+    obj = provider()
+    threading.Timer(0.01, provider.release, args=(obj,)).start()
+
+    assert provider() is obj
+    assert len(calls) == 1
+
+
+def test_pool_invalid_size():
+    """
+    Checking pools must hold at least one instance.
+    """
+    with pytest.raises(ValueError):
+        providers.Pool(object, pool_size=0)
+
+
+def test_pool_argument_refused():
+    """
+    Checking pools cannot be provider arguments, as their instances would never be returned.
+    """
+    pool = providers.Pool(object, pool_size=1)
+
+    with pytest.raises(TypeError, match="Pool cannot be a provider argument"):
+        providers.Factory(lambda obj: obj, pool)
+    with pytest.raises(TypeError, match="Pool cannot be a provider argument"):
+        providers.Singleton(lambda obj: obj, obj=pool)
+
+
+def test_pool_batch_refused():
+    """
+    Checking pools refuse batch evaluation, as their instances would never be returned.
+    """
+    provider = providers.Pool(object, pool_size=2)
+
+    with pytest.raises(TypeError, match="Pool cannot evaluate a batch"):
+        provider.many(3)
+    with pytest.raises(TypeError, match="Pool cannot evaluate a batch"):
+        provider.map([{}])
+
+    with provider.checkout():
+        pass
+
+
+def test_pool_injected_release():
+    """
+    Checking injected pool instances are returned once the function returns or raises.
+    """
+    provider = providers.Pool(object, pool_size=1, pool_timeout=0)
+
+    @wiring.inject
+    def func(obj=provider, /, fail=False):
+        if fail:
+            raise ValueError()
+        return obj
+
+    obj = func()
+    assert func() is obj
+
+    with pytest.raises(ValueError):
+        func(fail=True)
+
+    with provider.checkout() as checked_out:
+        assert checked_out is obj
+        assert func(None) is None  # Supplied arguments do not check out the pool.
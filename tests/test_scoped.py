@@ -0,0 +1,198 @@
+import asyncio
+import threading
+
+import pytest
+
+from scottzach1.pif import exceptions, providers, wiring
+
+
+def test_scoped_outside_scope():
+    """
+    Checking scoped providers cannot be evaluated outside a scope.
+    """
+    provider = providers.Scoped(object)
+
+    with pytest.raises(exceptions.NoActiveScopeException):
+        provider()
+
+
+def test_scoped_once_per_scope():
+    """
+    Checking scoped providers build once per scope, and nested scopes build their own instance.
+    """
+    provider = providers.Scoped(object)
+
+    with providers.Scope():
+        obj_1 = provider()
+        assert provider() is obj_1
+
+        with providers.Scope():
+            obj_2 = provider()
+            assert provider() is obj_2
+
+        assert provider() is obj_1
+
+    with providers.Scope():
+        assert provider() is not obj_1
+
+    assert obj_1 is not obj_2
+
+
+def test_scope_reentry():
+    """
+    Checking a scope can be entered again once exited, building new instances, but not while active.
+    """
+    provider = providers.Scoped(object)
+    scope = providers.Scope()
+
+    with scope:
+        obj = provider()
+        with pytest.raises(RuntimeError), scope:
+            pass
+
+    with scope:
+        assert providers.Scope.current() is scope
+        assert provider() is not obj
+
+    assert providers.Scope.current() is None
+
+
+def test_scoped_teardown():
+    """
+    Checking generator based instances are torn down in reverse order at scope exit.
+    """
+    events = []
+
+    def resource(name, *_):
+        events.append(f"setup {name}")
+        yield name
+        events.append(f"teardown {name}")
+
+    session = providers.Scoped(resource, "session")
+    unit_of_work = providers.Scoped(resource, "uow", session)
+
+    with providers.Scope():
+        assert unit_of_work() == "uow"
+        assert session() == "session"
+        assert events == ["setup session", "setup uow"]
+
+    assert events == ["setup session", "setup uow", "teardown uow", "teardown session"]
+
+
+def test_scoped_teardown_on_error():
+    """
+    Checking teardown runs when the scope exits with an exception, which is then propagated.
+    """
+    events = []
+
+    def resource():
+        try:
+            yield "value"
+        finally:
+            events.append("teardown")
+
+    provider = providers.Scoped(resource)
+
+    with pytest.raises(ValueError), providers.Scope():
+        provider()
+        raise ValueError()
+
+    assert events == ["teardown"]
+
+
+def test_scoped_async_teardown():
+    """
+    Checking async generator based instances are set up once per scope, and torn down before sync ones on async exit.
+    """
+    events = []
+
+    def engine():
+        yield "engine"
+        events.append("teardown engine")
+
+    async def session(engine):
+        events.append(f"setup session({engine})")
+        await asyncio.sleep(0)
+        yield "session"
+        events.append("teardown session")
+
+    provide_engine = providers.Scoped(engine)
+    provide_session = providers.Scoped(session, provide_engine)
+
+    async def main():
+        async with providers.Scope():
+            values = await asyncio.gather(provide_session(), provide_session())
+            assert await provide_session() == "session"
+        return values
+
+    assert asyncio.run(main()) == ["session", "session"]
+    assert events == ["setup session(engine)", "teardown session", "teardown engine"]
+
+    async def sync_exit():
+        with providers.Scope():
+            await provide_session()
+
+    with pytest.raises(RuntimeError, match="async with"):
+        asyncio.run(sync_exit())
+
+
+def test_scope_decorator_injected():
+    """
+    Checking each call of a scope decorated function shares one instance between injected functions.
+    """
+    provider = providers.Scoped(object)
+
+    @wiring.inject
+    def inner(obj=provider):
+        return obj
+
+    @providers.Scope()
+    @wiring.inject
+    def handler(obj=provider):
+        assert inner() is obj
+        return obj
+
+    assert handler() is not handler()
+
+
+def test_scope_threads():
+    """
+    Checking scopes do not leak between threads.
+    """
+    provider = providers.Scoped(object)
+    errors = []
+
+    with providers.Scope():
+        provider()
+
+        def target():
+            try:
+                provider()
+            except exceptions.NoActiveScopeException as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+
+    assert len(errors) == 1
+
+
+def test_scope_tasks():
+    """
+    Checking decorated coroutine functions get a scope per task.
+    """
+    provider = providers.Scoped(object)
+
+    @providers.Scope()
+    async def handler():
+        obj = provider()
+        await asyncio.sleep(0)
+        assert provider() is obj
+        return obj
+
+    async def main():
+        return await asyncio.gather(handler(), handler())
+
+    obj_1, obj_2 = asyncio.run(main())
+    assert obj_1 is not obj_2
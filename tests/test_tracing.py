@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from scottzach1.pif import providers, tracing, wiring
+
+
+def config():
+    return "config"
+
+
+def client(c):
+    return f"client({c})"
+
+
+ConfigProvider = providers.Factory(config)
+
+
+def make_handler():
+    """
+    Get an injected handler depending on a new (unevaluated) singleton.
+    """
+
+    @wiring.inject
+    def handler(c=providers.Singleton(client, ConfigProvider)):
+        return c
+
+    return handler
+
+
+def test_tracer_events():
+    """
+    Checking tracers receive nested events for injected calls and provider evaluations.
+    """
+    events = []
+
+    class Recorder(tracing.Tracer):
+        def enter(self, kind, target):
+            events.append(("enter", kind, tracing.describe(target)))
+            return len(events)
+
+        def exit(self, kind, target, state, elapsed_ns, error):
+            events.append(("exit", kind, tracing.describe(target), state, error))
+
+    with tracing.traced(Recorder()):
+        providers.Singleton(client, ConfigProvider)()
+
+    assert events == [
+        ("enter", "provider", "Singleton(client)"),
+        ("enter", "provider", "Factory(config)"),
+        ("exit", "provider", "Factory(config)", 2, None),
+        ("exit", "provider", "Singleton(client)", 1, None),
+    ]
+
+    events.clear()
+    make_handler()()  # Not registered, not recorded.
+    assert events == []
+
+
+def test_untraced_call_restored():
+    """
+    Checking Provider.__call__ is restored once every tracer is removed.
+    """
+    original = providers.Provider.__call__
+    tracer_1, tracer_2 = tracing.Tracer(), tracing.Tracer()
+
+    with tracing.traced(tracer_1), tracing.traced(tracer_2):
+        assert providers.Provider.__call__ is not original
+
+    assert providers.Provider.__call__ is original
+
+
+def test_resolution_tree():
+    """
+    Checking the resolution tracer builds a nested tree and exports collapsed stacks.
+    """
+    tracer = tracing.ResolutionTracer()
+    handler = make_handler()
+
+    with tracing.traced(tracer):
+        assert handler() == "client(config)"
+        with pytest.raises(ZeroDivisionError):
+            providers.Factory(lambda: 1 / 0)()
+
+    root, failed = tracer.roots
+    assert root.kind == tracing.INJECT
+    assert root.name == handler.__qualname__
+    assert [c.name for c in root.children] == ["Singleton(client)"]
+    assert [c.name for c in root.children[0].children] == ["Factory(config)"]
+    assert root.duration_ns >= root.children[0].duration_ns
+    assert failed.error
+
+    lines = tracer.collapsed(unit_ns=1).splitlines()
+    assert [line.rsplit(" ", 1)[0] for line in lines] == [
+        "make_handler.<locals>.handler",
+        "make_handler.<locals>.handler;Singleton(client)",
+        "make_handler.<locals>.handler;Singleton(client);Factory(config)",
+        "Factory(test_resolution_tree.<locals>.<lambda>)",
+    ]
+    assert all(int(line.rsplit(" ", 1)[1]) >= 0 for line in lines)
+
+    tracer.clear()
+    assert tracer.roots == []
+
+
+def test_resolution_tree_async():
+    """
+    Checking concurrent asyncio tasks are traced as separate trees.
+    """
+    tracer = tracing.ResolutionTracer()
+
+    @wiring.inject
+    async def async_handler(c=ConfigProvider):
+        await asyncio.sleep(0.01)
+        return c
+
+    async def main():
+        return await asyncio.gather(async_handler(), async_handler())
+
+    with tracing.traced(tracer):
+        assert asyncio.run(main()) == ["config", "config"]
+
+    assert [root.name for root in tracer.roots] == [async_handler.__qualname__] * 2
+    assert all([c.name for c in root.children] == ["Factory(config)"] for root in tracer.roots)
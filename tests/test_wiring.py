@@ -1,6 +1,13 @@
+import asyncio
+import importlib
 import inspect
+import os
+import subprocess
+import sys
 from unittest.mock import MagicMock
 
+import pytest
+
 from scottzach1.pif import providers, wiring
 
 
@@ -121,3 +128,329 @@ def test_patch_positional_or_keyword():
     assert p1("a", "b", "c1", "c2") == ("a", "b", "c1", "c2", "d_default", "e_injected")
     assert p1("a", "b", "c1", "c2", d="d") == ("a", "b", "c1", "c2", "d", "e_injected")
     assert p1("a", "b", "c1", "c2", d="d", e="e") == ("a", "b", "c1", "c2", "d", "e")
+
+
+def test_patch_keyword_only():
+    """
+    Test patching for KEYWORD_ONLY arguments regardless of how many positional arguments were supplied.
+    """
+
+    @wiring.inject
+    def p1(a, *b, c=provide("c")):
+        return a, *b, c
+
+    assert p1("a") == ("a", "c_injected")
+    assert p1("a", "b1", "b2", "b3") == ("a", "b1", "b2", "b3", "c_injected")
+    assert p1("a", "b1", c="c") == ("a", "b1", "c")
+
+
+def test_patch_only_missing():
+    """
+    Test that providers for supplied arguments are never evaluated.
+    """
+    mock = MagicMock()
+
+    @wiring.inject
+    def func(a=providers.Factory(mock), /, b=providers.Factory(mock), *, c=providers.Factory(mock)):
+        return a, b, c
+
+    assert func(1, 2, c=3) == (1, 2, 3)
+    assert func(1, b=2, c=3) == (1, 2, 3)
+    assert not mock.call_count
+
+    func(1)
+    assert mock.call_count == 2
+
+
+def test_patch_coroutine_function():
+    """
+    Test patching coroutine functions awaits async provider defaults.
+    """
+
+    async def make(v):
+        await asyncio.sleep(0)
+        return f"{v}_async"
+
+    @wiring.inject
+    async def func(a, b=providers.AsyncFactory(make, "b"), /, c=provide("c"), *, d=providers.AsyncSingleton(make, "d")):
+        return a, b, c, d
+
+    assert inspect.iscoroutinefunction(func)
+    assert asyncio.run(func("a")) == ("a", "b_async", "c_injected", "d_async")
+    assert asyncio.run(func("a", "b", c="c", d="d")) == ("a", "b", "c", "d")
+
+
+def test_wire_lazy():
+    """
+    Test lazy wiring defers importing a module, wiring it once it is imported.
+    """
+    name = "tests.wired.lazy_module"
+    sys.modules.pop(name, None)
+
+    wiring.wire([name], lazy=True)
+    assert name not in sys.modules
+
+    module = importlib.import_module(name)
+    assert module.my_func() == "lazy_injected"
+    assert wiring.is_patched(module.my_func)
+    assert not isinstance(module.__loader__, wiring._WiringLoader)
+
+    wiring.unwire([name])
+    assert isinstance(module.my_func(), providers.Provider)
+
+
+def test_unwire_lazy_pending():
+    """
+    Test unwiring a module still pending lazy wiring cancels it without importing.
+    """
+    name = "tests.wired.lazy_module"
+    sys.modules.pop(name, None)
+
+    wiring.wire([name], lazy=True)
+    wiring.unwire([name])
+    assert name not in sys.modules
+    assert wiring._finder not in sys.meta_path
+
+    module = importlib.import_module(name)
+    assert not wiring.is_patched(module.my_func)
+
+
+def test_wire_idempotent():
+    """
+    Test wiring a module twice does not patch its methods twice.
+    """
+    wiring.wire([__name__])
+    patched = my_func
+    wiring.wire([__name__])
+    assert my_func is patched
+
+    wiring.unwire([__name__])
+    assert not wiring.is_patched(my_func)
+
+
+def test_inject_descriptor():
+    """
+    Checking `Inject` attributes are resolved lazily, once per instance.
+    """
+    calls = []
+
+    class Service:
+        repo = wiring.Inject(providers.Factory(lambda: calls.append("repo") or object()))
+        name = wiring.Inject(providers.Singleton(lambda: "name"))
+
+    service, other = Service(), Service()
+    assert calls == []
+
+    assert service.repo is service.repo
+    assert other.repo is not service.repo
+    assert calls == ["repo", "repo"]
+    assert service.name == other.name == "name"
+
+    service.repo = "supplied"
+    assert service.repo == "supplied"
+    del service.repo
+    assert service.repo not in ("supplied", other.repo)
+
+
+def test_inject_descriptor_slots():
+    """
+    Checking `Inject` attributes keep their values in a slot for classes without an instance `__dict__`.
+    """
+
+    class Service:
+        __slots__ = ("_repo",)
+        repo = wiring.Inject(providers.Factory(object), slot="_repo")
+        name = wiring.Inject(providers.ExistingSingleton("name"))
+
+    service = Service()
+    assert service.repo is service.repo is service._repo
+    assert service.name == "name"
+
+    class Invalid:
+        __slots__ = ()
+
+    with pytest.raises(TypeError, match="slot"):
+        wiring.Inject(providers.Factory(object)).__set_name__(Invalid, "repo")
+
+
+def test_inject_descriptor_pool_refused():
+    """
+    Checking `Inject` refuses a pool, as each instance would keep one checked out.
+    """
+    with pytest.raises(TypeError, match="Pool cannot be a provider argument"):
+        wiring.Inject(providers.Pool(object, pool_size=1))
+
+
+def test_inject_class():
+    """
+    Checking decorating a class injects its `__init__`.
+    """
+
+    @wiring.inject
+    class Service:
+        def __init__(self, a: str = provide("a")):
+            self.a = a
+
+    assert Service().a == "a_injected"
+    assert Service("b").a == "b"
+
+
+def test_signature_from_code():
+    """
+    Checking signatures built from code objects match `inspect.signature` (for functions without annotations).
+    """
+    p = provide("p")
+
+    def f1(a, b=1, /, c=p, *args, d, e=p, **kwargs): ...
+
+    def f2(a=p, *, b=p): ...
+
+    def f3(a, /, b=p): ...
+
+    for func in (f1, f2, f3):
+        assert wiring._signature_from_code(func) == inspect.signature(func)
+
+
+def test_wire_static_and_inherited_methods():
+    """
+    Checking wiring keeps static methods static and patches inherited methods.
+    """
+    module = type(sys)("_pif_static_module")
+    exec(
+        "from scottzach1.pif import providers\n"
+        "P = providers.ExistingSingleton('injected')\n"
+        "class Base:\n"
+        "    def method(self, a=P):\n"
+        "        return a\n"
+        "    @staticmethod\n"
+        "    def static(a=P):\n"
+        "        return a\n"
+        "class Child(Base):\n"
+        "    pass\n",
+        module.__dict__,
+    )
+
+    wiring.wire([module])
+    assert module.Base().static() == module.Base.static() == "injected"
+    assert module.Child().method() == "injected"
+    assert isinstance(vars(module.Base)["static"], staticmethod)
+
+    wiring.unwire([module])
+    assert not wiring.is_patched(module.Base.static)
+    assert not wiring.is_patched(module.Child.method)
+    assert isinstance(vars(module.Base)["static"], staticmethod)
+
+
+def test_wiring_handle():
+    """
+    Checking unwiring a handle restores exactly the attributes it patched.
+    """
+    from tests.wired import cached_module
+
+    handle = wiring.wire([cached_module])
+    assert handle.modules == ["tests.wired.cached_module"]
+    assert handle.patched == 2
+    assert cached_module.Service().method() == "cached_injected"
+
+    # Attributes wired by another handle are left alone.
+    assert wiring.wire([cached_module]).patched == 0
+
+    wiring.unwire(handle)
+    assert not wiring.is_patched(cached_module.my_func)
+    assert not wiring.is_patched(cached_module.Service.method)
+    assert handle.patched == 0
+
+
+def test_wiring_rewire():
+    """
+    Checking a handle only re-wires modules that changed.
+    """
+    from tests.wired import cached_module
+
+    handle = wiring.wire([cached_module, sys.modules[__name__]], parallel=True)
+    try:
+        assert handle.rewire() == []
+
+        importlib.reload(cached_module)
+        assert not wiring.is_patched(cached_module.my_func)
+
+        assert handle.rewire() == ["tests.wired.cached_module"]
+        assert cached_module.my_func() == "cached_injected"
+        assert wiring.is_patched(cached_module.Service.method)
+        assert handle.rewire() == []
+    finally:
+        wiring.unwire(handle)
+
+    assert not wiring.is_patched(cached_module.my_func)
+    assert not wiring.is_patched(my_func)
+
+
+def test_wiring_handle_lazy():
+    """
+    Checking a handle records modules wired lazily once imported.
+    """
+    name = "tests.wired.lazy_module"
+    sys.modules.pop(name, None)
+
+    handle = wiring.wire([name], lazy=True)
+    assert handle.modules == []
+
+    module = importlib.import_module(name)
+    assert handle.modules == [name]
+    assert wiring.is_patched(module.my_func)
+
+    wiring.unwire(handle)
+    assert not wiring.is_patched(module.my_func)
+
+
+def test_wiring_handles_lazy_same_module():
+    """
+    Checking handles deferring the same module each keep their own pending entry.
+    """
+    name = "tests.wired.lazy_module"
+    sys.modules.pop(name, None)
+
+    first = wiring.wire([name], lazy=True)
+    second = wiring.wire([name], lazy=True)
+    cancelled = wiring.wire([name], lazy=True)
+    cancelled.unwire()
+    assert wiring._finder.pending[name] == [first, second]
+
+    module = importlib.import_module(name)
+    assert first.modules == second.modules == [name]
+    assert cancelled.modules == []
+    assert wiring.is_patched(module.my_func)
+    assert wiring._finder not in sys.meta_path
+
+    second.unwire()
+    first.unwire()
+    assert not wiring.is_patched(module.my_func)
+
+
+def test_wire_parallel_large():
+    """
+    Checking many large modules can be analysed concurrently.
+    """
+    from benchmarks.bench_wiring import synthetic_module
+
+    modules = [synthetic_module(f"_pif_parallel_{i}", functions=300, classes=20, methods=8) for i in range(8)]
+    try:
+        handle = wiring.wire(modules, parallel=True)
+        assert handle.patched == 8 * (150 + 20 * 4)
+        assert all(module.func_1(0) == (0, "value") for module in modules)
+
+        wiring.unwire(handle)
+        assert not any(wiring.is_patched(module.func_1) for module in modules)
+    finally:
+        for module in modules:
+            sys.modules.pop(module.__name__, None)
+
+
+def test_import_cost():
+    """
+    Checking importing the wiring module does not import asyncio or the static analysis.
+    """
+    code = "import sys, scottzach1.pif.wiring; print(sorted({'asyncio', 'scottzach1.pif.analysis'} & set(sys.modules)))"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+    assert result.stdout.strip() == "[]"
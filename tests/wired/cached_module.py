@@ -0,0 +1,19 @@
+from scottzach1.pif import providers
+
+StringProvider = providers.ExistingSingleton("cached_injected")
+
+
+def my_func(a: str = StringProvider):
+    """
+    A dummy method to test wiring a module from the cache.
+    """
+    return a
+
+
+def plain_func(a: str = "plain"):
+    return a
+
+
+class Service:
+    def method(self, a: str = StringProvider):
+        return a
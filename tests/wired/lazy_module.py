@@ -0,0 +1,8 @@
+from scottzach1.pif import providers
+
+
+def my_func(a: str = providers.ExistingSingleton("lazy_injected")):
+    """
+    A dummy method to test lazily wiring a module on import.
+    """
+    return a
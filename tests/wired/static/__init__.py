@@ -0,0 +1 @@
+from tests.wired.static.deps import Deps as Deps
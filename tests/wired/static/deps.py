@@ -0,0 +1,13 @@
+from scottzach1.pif import providers
+from scottzach1.pif.containers import Container
+
+Name = providers.ExistingSingleton("name")
+Alias = Name
+
+
+class Greeting(providers.Factory):
+    pass
+
+
+class Deps(Container):
+    greeting = Greeting(lambda name: f"hello {name}", Name)
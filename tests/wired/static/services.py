@@ -0,0 +1,46 @@
+from scottzach1.pif import providers as p
+
+from . import deps
+from .deps import Alias
+
+
+def helper():
+    return p.ExistingSingleton("helper")
+
+
+def by_alias(a: str = Alias):
+    return a
+
+
+async def by_module(a: str = deps.Name):
+    return a
+
+
+def by_container(a: str = deps.Deps.greeting, *, b: str = p.Factory(str)):
+    return a, b
+
+
+def by_helper(a=helper()):
+    return a
+
+
+def plain(a: str = "plain"):
+    return a
+
+
+class Base:
+    def method(self, a: str = Alias):
+        return a
+
+    @staticmethod
+    def static(a: str = Alias):
+        return a
+
+    @classmethod
+    def cls_method(cls, a: str = Alias):
+        return a
+
+
+class Child(Base):
+    def plain(self):
+        return None